@@ -1,11 +1,57 @@
 import streamlit as st
 import json
-import pandas as pd
 from datetime import datetime
 import uuid
 
 st.set_page_config(page_title="Workflow Builder", page_icon="🔧", layout="wide")
 
+STEP_TYPES = ("Send Email", "Create Ticket", "Assign Task", "API Call", "Approval", "Wait", "Condition")
+STEP_TYPE_INDEX = {step_type: i for i, step_type in enumerate(STEP_TYPES)}
+WORKFLOWS_PAGE_SIZE = 10
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_workflows(_data_manager, version):
+    """Load workflows, cached until workflows.json changes on disk"""
+    return _data_manager.get_workflows()
+
+# Widget key prefixes for each step type's config fields
+STEP_CONFIG_WIDGETS = {
+    "Send Email": {'to': 'email_to', 'subject': 'email_subject', 'template': 'email_template'},
+    "Create Ticket": {'ticket_type': 'ticket_type', 'priority': 'ticket_priority', 'assign_to': 'ticket_assign'}
+}
+
+def _sync_active_step():
+    """Copy the open editor's widget values into its step before it unmounts"""
+    ss = st.session_state
+    step_id = ss.get('active_step_id')
+    step = ss.workflow_steps.get(step_id)
+    if step is None or f"step_name_{step_id}" not in ss:
+        return
+    step['name'] = ss[f"step_name_{step_id}"]
+    step['type'] = ss[f"step_type_{step_id}"]
+    widgets = STEP_CONFIG_WIDGETS.get(step['type'])
+    if widgets:
+        step['config'] = {field: ss.get(f"{prefix}_{step_id}", '') for field, prefix in widgets.items()}
+
+def _add_step():
+    """Append an empty step and open it for editing"""
+    _sync_active_step()
+    step_id = str(uuid.uuid4())
+    st.session_state.workflow_steps[step_id] = {
+        'id': step_id,
+        'name': '',
+        'type': 'Send Email',
+        'config': {}
+    }
+    st.session_state.active_step_id = step_id
+
+def _set_active_step(step_id):
+    _sync_active_step()
+    st.session_state.active_step_id = step_id
+
+def _remove_step(step_id):
+    st.session_state.workflow_steps.pop(step_id, None)
+
 def main():
     st.title("🔧 Workflow Builder")
     st.markdown("### Create and manage automated workflows")
@@ -57,39 +103,44 @@ def create_workflow_form(data_manager):
     # Steps management outside of form
     st.markdown("#### Workflow Steps")
     
-    # Initialize steps in session state
-    if 'workflow_steps' not in st.session_state:
-        st.session_state.workflow_steps = []
-    
-    # Add step button
-    if st.button("Add Step"):
-        st.session_state.workflow_steps.append({
-            'id': str(uuid.uuid4()),
-            'name': '',
-            'type': 'Send Email',
-            'config': {}
-        })
-        st.rerun()
-    
-    # Display and edit steps
-    for i, step in enumerate(st.session_state.workflow_steps):
-        with st.expander(f"Step {i+1}: {step.get('name', 'Unnamed Step')}", expanded=True):
+    # Initialize steps in session state, keyed by step id
+    ss = st.session_state
+    if 'workflow_steps' not in ss:
+        ss.workflow_steps = {}
+    
+    steps = ss.workflow_steps
+    active_step_id = ss.get('active_step_id')
+    
+    # Display steps; only the active step gets editing widgets
+    for i, (step_id, step) in enumerate(list(steps.items()), 1):
+        if active_step_id != step_id:
+            col1, col2, col3 = st.columns([3, 1, 1])
+            with col1:
+                st.markdown(f"**Step {i}: {step.get('name') or 'Unnamed Step'}** ({step['type']})")
+            with col2:
+                st.button("Edit", key=f"edit_step_{step_id}", on_click=_set_active_step, args=(step_id,))
+            with col3:
+                st.button("Remove", key=f"remove_step_{step_id}", on_click=_remove_step, args=(step_id,))
+            continue
+        
+        with st.expander(f"Step {i}: {step.get('name') or 'Unnamed Step'}", expanded=True):
             col1, col2 = st.columns([3, 1])
             
             with col1:
-                step_name = st.text_input(f"Step Name", value=step.get('name', ''), key=f"step_name_{i}")
+                step_name = st.text_input(f"Step Name", value=step.get('name', ''), key=f"step_name_{step_id}")
                 step_type = st.selectbox(
                     f"Step Type", 
-                    ["Send Email", "Create Ticket", "Assign Task", "API Call", "Approval", "Wait", "Condition"],
-                    index=["Send Email", "Create Ticket", "Assign Task", "API Call", "Approval", "Wait", "Condition"].index(step.get('type', 'Send Email')) if step.get('type') in ["Send Email", "Create Ticket", "Assign Task", "API Call", "Approval", "Wait", "Condition"] else 0,
-                    key=f"step_type_{i}"
+                    STEP_TYPES,
+                    index=STEP_TYPE_INDEX.get(step.get('type'), 0),
+                    key=f"step_type_{step_id}"
                 )
                 
                 # Step-specific configuration
+                config = step.get('config', {})
                 if step_type == "Send Email":
-                    to_email = st.text_input("To Email", value=step.get('config', {}).get('to', ''), key=f"email_to_{i}")
-                    subject = st.text_input("Subject", value=step.get('config', {}).get('subject', ''), key=f"email_subject_{i}")
-                    template = st.text_area("Email Template", value=step.get('config', {}).get('template', ''), key=f"email_template_{i}")
+                    to_email = st.text_input("To Email", value=config.get('to', ''), key=f"email_to_{step_id}")
+                    subject = st.text_input("Subject", value=config.get('subject', ''), key=f"email_subject_{step_id}")
+                    template = st.text_area("Email Template", value=config.get('template', ''), key=f"email_template_{step_id}")
                     
                     step['config'] = {
                         'to': to_email,
@@ -98,9 +149,19 @@ def create_workflow_form(data_manager):
                     }
                 
                 elif step_type == "Create Ticket":
-                    ticket_type = st.selectbox("Ticket Type", ["IT Support", "HR Request", "Facilities"], key=f"ticket_type_{i}")
-                    priority = st.selectbox("Priority", ["Low", "Medium", "High", "Critical"], key=f"ticket_priority_{i}")
-                    assign_to = st.text_input("Assign To", value=step.get('config', {}).get('assign_to', ''), key=f"ticket_assign_{i}")
+                    ticket_types = ["IT Support", "HR Request", "Facilities"]
+                    priorities = ["Low", "Medium", "High", "Critical"]
+                    ticket_type = st.selectbox(
+                        "Ticket Type", ticket_types,
+                        index=ticket_types.index(config['ticket_type']) if config.get('ticket_type') in ticket_types else 0,
+                        key=f"ticket_type_{step_id}"
+                    )
+                    priority = st.selectbox(
+                        "Priority", priorities,
+                        index=priorities.index(config['priority']) if config.get('priority') in priorities else 0,
+                        key=f"ticket_priority_{step_id}"
+                    )
+                    assign_to = st.text_input("Assign To", value=config.get('assign_to', ''), key=f"ticket_assign_{step_id}")
                     
                     step['config'] = {
                         'ticket_type': ticket_type,
@@ -113,9 +174,11 @@ def create_workflow_form(data_manager):
                 step['type'] = step_type
             
             with col2:
-                if st.button("Remove", key=f"remove_step_{i}"):
-                    st.session_state.workflow_steps.pop(i)
-                    st.rerun()
+                st.button("Done", key=f"done_step_{step_id}", on_click=_set_active_step, args=(None,))
+                st.button("Remove", key=f"remove_step_{step_id}", on_click=_remove_step, args=(step_id,))
+    
+    # Callbacks run before the script, so the new step renders on this pass
+    st.button("Add Step", on_click=_add_step)
     # Handle form submission
     if submitted:
         if name and description:
@@ -128,7 +191,7 @@ def create_workflow_form(data_manager):
                     'type': trigger_type,
                     'config': {}
                 },
-                'steps': st.session_state.workflow_steps,
+                'steps': list(steps.values()),
                 'created_date': datetime.now().isoformat(),
                 'status': 'active',
                 'version': '1.0'
@@ -142,7 +205,7 @@ def create_workflow_form(data_manager):
             
             data_manager.save_workflow(workflow)
             st.success(f"Workflow '{name}' created successfully!")
-            st.session_state.workflow_steps = []  # Reset steps
+            ss.workflow_steps = {}  # Reset steps
             st.rerun()
         else:
             st.error("Please fill in all required fields.")
@@ -150,10 +213,15 @@ def create_workflow_form(data_manager):
 def manage_workflows(data_manager):
     st.subheader("Existing Workflows")
     
-    workflows = data_manager.get_workflows()
+    workflows = _load_workflows(data_manager, data_manager.get_data_version("workflows.json"))
     
     if workflows:
-        for workflow in workflows:
+        page_count = max(1, -(-len(workflows) // WORKFLOWS_PAGE_SIZE))
+        page = 1
+        if page_count > 1:
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key="workflows_page")
+        
+        for workflow in workflows[(page - 1) * WORKFLOWS_PAGE_SIZE:page * WORKFLOWS_PAGE_SIZE]:
             with st.expander(f"{workflow['name']} ({workflow['category']})"):
                 col1, col2, col3 = st.columns([2, 1, 1])
                 
@@ -222,9 +290,10 @@ def show_demo_script():
         {"name": "Add to Systems", "type": "API Call", "config": "Automatically provision Active Directory, email, VPN"}
     ]
     
-    for i, step in enumerate(demo_steps, 1):
-        st.markdown(f"**{i}. {step['name']}** ({step['type']})")
-        st.caption(step['config'])
+    st.markdown("\n\n".join(
+        f"**{i}. {step['name']}** ({step['type']})  \n:gray[{step['config']}]"
+        for i, step in enumerate(demo_steps, 1)
+    ))
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,48 @@
 import streamlit as st
 import pandas as pd
+import json
+import re
 from datetime import datetime, timedelta
 import uuid
+from types import MappingProxyType
+from utils.data_manager import parse_stored_value
 
 st.set_page_config(page_title="Onboarding", page_icon="👋", layout="wide")
 
+EMPLOYEES_PAGE_SIZE = 25
+
+EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+EMPLOYEE_ID_RE = re.compile(r'^EMP[0-9A-Z]+$')
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_users(_data_manager, version):
+    """Load the users DataFrame, cached until users.csv changes on disk"""
+    return _data_manager.get_users()
+
+def _compute_summary_metrics(users_df):
+    """Status counts and average progress for a slice of the users table"""
+    status_counts = {status: int(count) for status, count in users_df['status'].value_counts().items()}
+    return status_counts, float(users_df['onboarding_progress'].mean())
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _summary_metrics(_users_df, version):
+    """Full-table metrics, cached until users.csv changes on disk"""
+    return _compute_summary_metrics(_users_df)
+
+def _checklist_markdown(checklist):
+    """Render a {category: [items]} checklist as a single markdown block"""
+    return "\n\n".join(
+        f"**{category}:**\n" + "\n".join(f"- {item}" for item in items)
+        for category, items in checklist.items()
+    )
+
+def _checklist_frame(checklist):
+    """Long-form (category, item, done) view of a {category: [items]} checklist"""
+    return pd.DataFrame(
+        [(category, item, False) for category, items in checklist.items() for item in items],
+        columns=['category', 'item', 'done']
+    )
+
 def main():
     st.title("👋 Employee Onboarding")
     st.markdown("### Automated onboarding workflows and tracking")
@@ -25,6 +63,7 @@ def main():
     
     with tab2:
         onboarding_dashboard(data_manager)
+        bulk_onboarding(data_manager, ai_services)
     
     with tab3:
         checklist_templates(data_manager)
@@ -35,6 +74,10 @@ def main():
 def new_employee_form(data_manager, ai_services):
     st.subheader("Add New Employee")
     
+    # Generate the suggested ID once, so it stays put across reruns
+    if 'default_emp_id' not in st.session_state:
+        st.session_state.default_emp_id = f"EMP{uuid.uuid4().hex[:6].upper()}"
+    
     with st.form("new_employee_form"):
         col1, col2 = st.columns(2)
         
@@ -42,7 +85,7 @@ def new_employee_form(data_manager, ai_services):
             first_name = st.text_input("First Name")
             last_name = st.text_input("Last Name")
             email = st.text_input("Email Address")
-            employee_id = st.text_input("Employee ID", value=f"EMP{uuid.uuid4().hex[:6].upper()}")
+            employee_id = st.text_input("Employee ID", value=st.session_state.default_emp_id)
         
         with col2:
             department = st.selectbox("Department", ["Engineering", "HR", "Sales", "Marketing", "Finance", "Operations"])
@@ -71,7 +114,15 @@ def new_employee_form(data_manager, ai_services):
         submitted = st.form_submit_button("Create Employee & Start Onboarding")
         
         if submitted:
-            if first_name and last_name and email and role:
+            errors = []
+            if not (first_name and last_name and email and role):
+                errors.append("Please fill in all required fields.")
+            if email and not EMAIL_RE.match(email):
+                errors.append("Please enter a valid email address.")
+            if not EMPLOYEE_ID_RE.match(employee_id):
+                errors.append("Employee ID must be EMP followed by letters or digits (e.g. EMP1A2B3C).")
+            
+            if not errors:
                 # Create employee record
                 employee = {
                     'id': employee_id,
@@ -93,27 +144,39 @@ def new_employee_form(data_manager, ai_services):
                 
                 # Generate AI-powered onboarding checklist
                 checklist = generate_onboarding_checklist(ai_services, employee)
-                employee['checklist'] = checklist
+                employee['checklist'] = json.dumps(checklist)
+                # JSON like the seed rows, so readers never fall back to literal_eval
+                employee['equipment_needed'] = json.dumps(equipment_needed)
+                employee['system_access'] = json.dumps(system_access)
                 
                 # Save employee
                 data_manager.add_user(employee)
+                del st.session_state.default_emp_id
                 
                 st.success(f"Employee {first_name} {last_name} added successfully!")
                 st.success("AI-generated onboarding checklist created and assigned.")
                 
                 # Display generated checklist
                 st.markdown("### Generated Onboarding Checklist")
-                for category, items in checklist.items():
-                    st.markdown(f"**{category}:**")
-                    for item in items:
-                        st.markdown(f"- {item}")
+                st.markdown(_checklist_markdown(checklist))
                 
             else:
-                st.error("Please fill in all required fields.")
+                st.error("\n".join(f"- {error}" for error in errors))
 
 def generate_onboarding_checklist(ai_services, employee):
     """Generate AI-powered onboarding checklist based on role and requirements"""
     
+    # Sorted tuples give identical profiles the same cache key
+    return _build_checklist(
+        employee['department'],
+        tuple(sorted(employee['equipment_needed'])),
+        tuple(sorted(employee['system_access']))
+    )
+
+@st.cache_data(show_spinner=False)
+def _build_checklist(department, equipment_needed, system_access):
+    """Build the onboarding checklist for a department/equipment/access profile"""
+    
     # Create a comprehensive checklist based on employee details
     checklist = {
         "Pre-boarding (Before Start Date)": [
@@ -146,13 +209,13 @@ def generate_onboarding_checklist(ai_services, employee):
     }
     
     # Customize based on role and department
-    if employee['department'] == 'Engineering':
+    if department == 'Engineering':
         checklist["Week 1 - Integration"].extend([
             "Code repository access and setup",
             "Development environment configuration",
             "Architecture overview session"
         ])
-    elif employee['department'] == 'Sales':
+    elif department == 'Sales':
         checklist["Week 1 - Integration"].extend([
             "CRM system training",
             "Product knowledge sessions",
@@ -160,10 +223,10 @@ def generate_onboarding_checklist(ai_services, employee):
         ])
     
     # Add equipment-specific tasks
-    if 'Laptop' in employee['equipment_needed']:
+    if 'Laptop' in equipment_needed:
         checklist["Day 1 - Welcome & Setup"].append("Laptop configuration and software installation")
     
-    if 'VPN' in employee['system_access']:
+    if 'VPN' in system_access:
         checklist["Day 1 - Welcome & Setup"].append("VPN setup and security training")
     
     return checklist
@@ -171,136 +234,219 @@ def generate_onboarding_checklist(ai_services, employee):
 def onboarding_dashboard(data_manager):
     st.subheader("Onboarding Dashboard")
     
-    users_df = data_manager.get_users()
+    users_version = data_manager.get_data_version("users.csv")
+    users_df = _load_users(data_manager, users_version)
     
     if users_df.empty:
         st.info("No employees in the system yet.")
         return
     
-    # Summary metrics
-    col1, col2, col3, col4 = st.columns(4)
-    
-    pending_onboarding = len(users_df[users_df['status'] == 'pending'])
-    in_progress = len(users_df[users_df['status'] == 'in_progress'])
-    completed = len(users_df[users_df['status'] == 'completed'])
-    
-    with col1:
-        st.metric("Pending", pending_onboarding)
-    with col2:
-        st.metric("In Progress", in_progress)
-    with col3:
-        st.metric("Completed", completed)
-    with col4:
-        avg_progress = users_df['onboarding_progress'].mean() if not users_df.empty else 0
-        st.metric("Avg Progress", f"{avg_progress:.0f}%")
+    # Summary metrics, filled in once the current page is known
+    metrics_container = st.container()
     
     # Employee list with actions
     st.markdown("### Employee Onboarding Status")
     
-    for _, employee in users_df.iterrows():
-        with st.expander(f"{employee['first_name']} {employee['last_name']} - {employee['status'].title()}"):
-            col1, col2, col3 = st.columns([2, 1, 1])
+    page_count = max(1, -(-len(users_df) // EMPLOYEES_PAGE_SIZE))
+    page = 1
+    if page_count > 1:
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key="employees_page")
+    page_df = users_df.iloc[(page - 1) * EMPLOYEES_PAGE_SIZE:page * EMPLOYEES_PAGE_SIZE]
+    
+    with metrics_container:
+        full_metrics = page_count == 1 or st.toggle("Full-dataset metrics", value=False, key="full_metrics")
+        if full_metrics:
+            status_counts, avg_progress = _summary_metrics(users_df, users_version)
+        else:
+            status_counts, avg_progress = _compute_summary_metrics(page_df)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Pending", status_counts.get('pending', 0))
+        with col2:
+            st.metric("In Progress", status_counts.get('in_progress', 0))
+        with col3:
+            st.metric("Completed", status_counts.get('completed', 0))
+        with col4:
+            st.metric("Avg Progress", f"{avg_progress:.0f}%")
+    
+    # One table for the whole page; detail widgets only for the selected row
+    event = st.dataframe(
+        page_df[['first_name', 'last_name', 'role', 'department', 'status', 'onboarding_progress']],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'onboarding_progress': st.column_config.ProgressColumn("Progress", min_value=0, max_value=100, format="%d%%")
+        },
+        on_select="rerun",
+        selection_mode="single-row",
+        key="employees_table"
+    )
+    
+    selected_rows = [row for row in event.selection.rows if row < len(page_df)]
+    if not selected_rows:
+        st.caption("Select an employee to view details and actions.")
+        return
+    
+    # A plain dict record; Series.get can return a Series on duplicate labels
+    employee = page_df.iloc[[selected_rows[0]]].to_dict('records')[0]
+    with st.expander(f"{employee['first_name']} {employee['last_name']} - {employee['status'].title()}", expanded=True):
+        col1, col2, col3 = st.columns([2, 1, 1])
+        
+        with col1:
+            st.write(f"**Role:** {employee['role']}")
+            st.write(f"**Department:** {employee['department']}")
+            st.write(f"**Start Date:** {employee['start_date']}")
+            st.write(f"**Manager:** {employee['manager']}")
             
-            with col1:
-                st.write(f"**Role:** {employee['role']}")
-                st.write(f"**Department:** {employee['department']}")
-                st.write(f"**Start Date:** {employee['start_date']}")
-                st.write(f"**Manager:** {employee['manager']}")
-                
-                # Progress bar
-                progress = employee.get('onboarding_progress', 0)
-                st.progress(progress / 100)
-                st.caption(f"Onboarding Progress: {progress}%")
+            # Progress bar
+            progress = employee.get('onboarding_progress', 0)
+            st.progress(progress / 100)
+            st.caption(f"Onboarding Progress: {progress}%")
+        
+        with col2:
+            show_checklist = st.toggle("View Checklist", key="show_checklist")
             
-            with col2:
-                if st.button("View Checklist", key=f"checklist_{employee['id']}"):
-                    st.session_state[f"show_checklist_{employee['id']}"] = True
-                
-                if st.button("Update Progress", key=f"progress_{employee['id']}"):
-                    new_progress = st.slider(
-                        "Progress", 0, 100, progress, 
-                        key=f"slider_{employee['id']}"
-                    )
+            with st.form("progress_form", border=False):
+                new_progress = st.slider("Progress", 0, 100, int(progress))
+                if st.form_submit_button("Update Progress"):
                     data_manager.update_user_progress(employee['id'], new_progress)
                     st.rerun()
+        
+        with col3:
+            if employee['status'] == 'pending':
+                if st.button("Start Onboarding", key="start_onboarding"):
+                    data_manager.update_user_status(employee['id'], 'in_progress')
+                    st.success("Onboarding started!")
+                    st.rerun()
             
-            with col3:
-                if employee['status'] == 'pending':
-                    if st.button("Start Onboarding", key=f"start_{employee['id']}"):
-                        data_manager.update_user_status(employee['id'], 'in_progress')
-                        st.success("Onboarding started!")
-                        st.rerun()
-                
-                elif employee['status'] == 'in_progress':
-                    if st.button("Mark Complete", key=f"complete_{employee['id']}"):
-                        data_manager.update_user_status(employee['id'], 'completed')
-                        data_manager.update_user_progress(employee['id'], 100)
-                        st.success("Onboarding completed!")
-                        st.rerun()
-            
-            # Show checklist if requested
-            if st.session_state.get(f"show_checklist_{employee['id']}", False):
-                st.markdown("**Onboarding Checklist:**")
-                if 'checklist' in employee and employee['checklist']:
-                    checklist = eval(employee['checklist']) if isinstance(employee['checklist'], str) else employee['checklist']
-                    for category, items in checklist.items():
-                        st.markdown(f"**{category}:**")
-                        for item in items:
-                            st.markdown(f"- {item}")
+            elif employee['status'] == 'in_progress':
+                if st.button("Mark Complete", key="complete_onboarding"):
+                    data_manager.update_users_bulk([
+                        (employee['id'], 'status', 'completed'),
+                        (employee['id'], 'onboarding_progress', 100)
+                    ])
+                    st.success("Onboarding completed!")
+                    st.rerun()
+        
+        # Show checklist if requested
+        if show_checklist:
+            st.markdown("**Onboarding Checklist:**")
+            if 'checklist' in employee:
+                checklist = parse_stored_value(employee['checklist'], dict)
+                task_counts = _checklist_frame(checklist).groupby('category', sort=False).size()
+                st.caption(f"{task_counts.sum()} tasks across {len(task_counts)} phases")
+                st.markdown(_checklist_markdown(checklist))
 
-def checklist_templates(data_manager):
-    st.subheader("Onboarding Checklist Templates")
+def bulk_onboarding(data_manager, ai_services):
+    """Generate AI checklists for every employee without one through the OpenAI Batch API"""
+    st.markdown("### Bulk Onboard")
+    
+    if not ai_services.openai_client:
+        st.info("Bulk onboarding uses the OpenAI Batch API. Set OPENAI_API_KEY to enable it.")
+        return
     
-    templates = {
-        "Engineering": {
-            "Week 1": [
+    batch_id = st.session_state.get('onboarding_batch_id')
+    if batch_id is None:
+        users_df = _load_users(data_manager, data_manager.get_data_version("users.csv"))
+        pending = users_df[~users_df['checklist'].map(lambda raw: parse_stored_value(raw, dict)).astype(bool)] if not users_df.empty else users_df
+        st.caption(
+            f"{len(pending)} employees have no checklist yet. "
+            "Batch jobs cost half as much as individual requests but can take up to 24 hours."
+        )
+        if st.button("Submit Batch", disabled=pending.empty, key="submit_onboarding_batch"):
+            employees = [
+                {
+                    **employee,
+                    'equipment_needed': parse_stored_value(employee['equipment_needed'], list),
+                    'system_access': parse_stored_value(employee['system_access'], list)
+                }
+                for employee in pending.to_dict('records')
+            ]
+            try:
+                st.session_state.onboarding_batch_id = ai_services.submit_onboarding_batch(employees)
+            except Exception as e:
+                st.error(f"Could not submit the batch: {e}")
+                return
+            st.rerun()
+        return
+    
+    st.caption(f"Batch `{batch_id}` submitted.")
+    if st.button("Check Batch Status", key="check_onboarding_batch"):
+        try:
+            batch = ai_services.poll_batch(batch_id)
+        except Exception as e:
+            st.error(f"Could not check the batch: {e}")
+            return
+        
+        if batch['status'] == 'completed':
+            checklists = ai_services.parse_batch_output(batch['output_file_id']) if batch['output_file_id'] else {}
+            if data_manager.update_user_checklists(checklists):
+                del st.session_state.onboarding_batch_id
+                st.success(f"Checklists saved for {len(checklists)} employees ({batch['failed']} failed).")
+            else:
+                st.error("Failed to save the generated checklists.")
+        elif batch['status'] in ('failed', 'expired', 'cancelled'):
+            del st.session_state.onboarding_batch_id
+            st.error(f"Batch {batch['status']}.")
+        else:
+            st.info(f"Batch {batch['status'].replace('_', ' ')}: {batch['completed']} of {batch['total']} done.")
+
+@st.cache_resource
+def _checklist_templates():
+    """Department checklist templates, built once per server process"""
+    return MappingProxyType({
+        "Engineering": MappingProxyType({
+            "Week 1": (
                 "Code repository access",
                 "Development environment setup",
                 "Architecture overview",
                 "Team introductions"
-            ],
-            "Month 1": [
+            ),
+            "Month 1": (
                 "First code contribution",
                 "Code review process training",
                 "Technical mentorship assignment"
-            ]
-        },
-        "Sales": {
-            "Week 1": [
+            )
+        }),
+        "Sales": MappingProxyType({
+            "Week 1": (
                 "CRM system training",
                 "Product knowledge sessions",
                 "Sales process overview",
                 "Territory assignment"
-            ],
-            "Month 1": [
+            ),
+            "Month 1": (
                 "First client meeting",
                 "Sales methodology training",
                 "Pipeline management"
-            ]
-        },
-        "HR": {
-            "Week 1": [
+            )
+        }),
+        "HR": MappingProxyType({
+            "Week 1": (
                 "HRIS system training",
                 "Employment law overview",
                 "Policy and procedure review"
-            ],
-            "Month 1": [
+            ),
+            "Month 1": (
                 "First recruitment cycle",
                 "Employee relations training",
                 "Compliance certification"
-            ]
-        }
-    }
+            )
+        })
+    })
+
+def checklist_templates(data_manager):
+    st.subheader("Onboarding Checklist Templates")
+    
+    templates = _checklist_templates()
     
     selected_dept = st.selectbox("Department", list(templates.keys()))
     
     if selected_dept:
         st.markdown(f"### {selected_dept} Onboarding Template")
         
-        for period, tasks in templates[selected_dept].items():
-            st.markdown(f"**{period}:**")
-            for task in tasks:
-                st.markdown(f"- {task}")
+        st.markdown(_checklist_markdown(templates[selected_dept]))
     
     # Allow customization
     st.markdown("### Customize Template")
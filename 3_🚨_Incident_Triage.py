@@ -1,11 +1,118 @@
 import streamlit as st
 import pandas as pd
 import re
+import json
 from datetime import datetime
-import uuid
+import secrets
+from itertools import chain
+from types import MappingProxyType
+from utils.data_manager import parse_stored_value
 
 st.set_page_config(page_title="Incident Triage", page_icon="🚨", layout="wide")
 
+KEYWORDS = MappingProxyType({
+    'security': ('password', 'login', 'access', 'hack', 'breach', 'unauthorized', 'virus', 'malware'),
+    'network': ('connection', 'internet', 'wifi', 'vpn', 'slow', 'timeout', 'ping'),
+    'email': ('email', 'outlook', 'mail', 'send', 'receive', 'attachment'),
+    'hardware': ('laptop', 'computer', 'printer', 'mouse', 'keyboard', 'screen', 'monitor'),
+    'software': ('application', 'app', 'program', 'software', 'install', 'update'),
+    'database': ('database', 'sql', 'query', 'data', 'report', 'export'),
+    'critical': ('down', 'downtime', 'outage', 'critical', 'urgent', 'emergency', 'broken', 'failure')
+})
+
+INCIDENTS_PAGE_SIZE = 25
+
+# Low-cardinality incident columns, held as categoricals so filters compare integer codes
+INCIDENT_CATEGORICAL_COLUMNS = ('status', 'priority', 'urgency', 'impact', 'assigned_team', 'category', 'source')
+
+URGENCY_SCORES = MappingProxyType({'Low': 10, 'Medium': 30, 'High': 60, 'Critical': 90})
+
+IMPACT_MULTIPLIERS = MappingProxyType({'Individual': 1.0, 'Department': 1.2, 'Organization': 1.5, 'External': 2.0})
+
+# Form options; urgency and impact levels follow their scoring tables
+INCIDENT_CATEGORIES = ("Hardware", "Software", "Network", "Security", "Access", "Other")
+URGENCY_LEVELS = tuple(URGENCY_SCORES)
+IMPACT_LEVELS = tuple(IMPACT_MULTIPLIERS)
+INCIDENT_SOURCES = ("Email", "Phone", "Chat", "Portal", "Monitoring")
+
+HIGH_IMPACT_LEVELS = frozenset({'Organization', 'External'})
+
+# Fixed reasoning sentences for keyword categories, in the order they are reported
+KEYWORD_REASONS = MappingProxyType({
+    'critical': "Critical keywords detected in description",
+    'security': "Security-related incident requiring immediate attention"
+})
+
+AFFECTED_SYSTEMS = ("Email", "CRM", "ERP", "Website", "Database", "VPN", "Active Directory")
+
+SYSTEM_TAGS = MappingProxyType({system: system.lower().replace(' ', '_') for system in AFFECTED_SYSTEMS})
+
+TEAM_MAPPING = MappingProxyType({
+    'Hardware': 'IT Support',
+    'Software': 'Application Support',
+    'Network': 'Network Operations',
+    'Security': 'Security Team',
+    'Access': 'Identity & Access'
+})
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_incidents(_data_manager, version):
+    """Load incidents with created_date parsed once, cached until incidents.csv changes on disk"""
+    incidents_df = _data_manager.get_incidents()
+    if not incidents_df.empty:
+        incidents_df['created_dt'] = pd.to_datetime(incidents_df['created_date'], format='ISO8601')
+        incidents_df = incidents_df.astype({column: 'category' for column in INCIDENT_CATEGORICAL_COLUMNS})
+        for column in ('affected_systems', 'tags'):
+            incidents_df[column] = incidents_df[column].map(lambda raw: parse_stored_value(raw, list))
+    return incidents_df
+
+# Keywords shown on the Triage Rules tab for each team
+TEAM_RULES = MappingProxyType({
+    "Security Team": ("security", "password", "breach", "unauthorized"),
+    "Network Operations": ("network", "connection", "vpn", "internet"),
+    "Database Team": ("database", "sql", "data", "report"),
+    "Application Support": ("software", "application", "program"),
+    "IT Support": ("hardware", "laptop", "printer", "computer")
+})
+
+@st.cache_data(show_spinner=False)
+def _rules_markdown():
+    """Triage rules overview as one markdown block, built once per process"""
+    urgency = ", ".join(f"{level}: {score}" for level, score in URGENCY_SCORES.items())
+    impact = ", ".join(f"{level}: {multiplier}" for level, multiplier in IMPACT_MULTIPLIERS.items())
+    team_rules = "\n\n".join(f"**{team}:** {', '.join(keywords)}" for team, keywords in TEAM_RULES.items())
+    return (
+        "### Current AI Triage Rules\n\n"
+        "**Priority Calculation:**\n"
+        f"- Urgency score ({urgency})\n"
+        f"- Impact multiplier ({impact})\n"
+        "- Keyword bonuses (Critical: +30, Security: +20, Network+Organization: +15)\n\n"
+        "**Team Assignment Rules:**\n\n"
+        f"{team_rules}"
+    )
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+# Endings that still count as the keyword: plurals, past tense, "-ing" and "-er" forms
+KEYWORD_SUFFIXES = ('', 's', 'es', 'd', 'ed', 'ing', 'er', 'ers')
+
+def _keyword_forms(keyword):
+    """The keyword and its inflected forms, dropping a final "e" before "-ing" ("update" -> "updating")"""
+    forms = {keyword + suffix for suffix in KEYWORD_SUFFIXES}
+    if keyword.endswith('e'):
+        forms.add(keyword[:-1] + 'ing')
+    return forms
+
+@st.cache_resource
+def _keyword_index():
+    """Map each keyword form to its category, built once per server process"""
+    return MappingProxyType({
+        form: category
+        for category, words in KEYWORDS.items()
+        for word in words
+        for form in _keyword_forms(word)
+    })
+
 def main():
     st.title("🚨 Incident Triage")
     st.markdown("### AI-powered incident classification and routing")
@@ -28,7 +135,7 @@ def main():
         incident_dashboard(data_manager)
     
     with tab3:
-        triage_rules_management(data_manager)
+        triage_rules_management(data_manager, ai_services)
     
     with tab4:
         show_demo_script()
@@ -42,12 +149,12 @@ def submit_incident_form(data_manager, ai_services):
         with col1:
             title = st.text_input("Incident Title")
             customer = st.text_input("Customer/Requester")
-            category = st.selectbox("Category", ["Hardware", "Software", "Network", "Security", "Access", "Other"])
+            category = st.selectbox("Category", INCIDENT_CATEGORIES)
         
         with col2:
-            urgency = st.selectbox("Urgency", ["Low", "Medium", "High", "Critical"])
-            impact = st.selectbox("Impact", ["Individual", "Department", "Organization", "External"])
-            source = st.selectbox("Source", ["Email", "Phone", "Chat", "Portal", "Monitoring"])
+            urgency = st.selectbox("Urgency", URGENCY_LEVELS)
+            impact = st.selectbox("Impact", IMPACT_LEVELS)
+            source = st.selectbox("Source", INCIDENT_SOURCES)
         
         description = st.text_area("Detailed Description", height=150)
         
@@ -58,7 +165,7 @@ def submit_incident_form(data_manager, ai_services):
         with col1:
             affected_systems = st.multiselect(
                 "Affected Systems",
-                ["Email", "CRM", "ERP", "Website", "Database", "VPN", "Active Directory"]
+                AFFECTED_SYSTEMS
             )
         
         with col2:
@@ -69,17 +176,19 @@ def submit_incident_form(data_manager, ai_services):
         if submitted:
             if title and description and customer:
                 # Generate incident ID
-                incident_id = f"INC{datetime.now().strftime('%Y%m%d')}{uuid.uuid4().hex[:4].upper()}"
+                now = datetime.now()
+                incident_id = f"INC{now:%Y%m%d}{secrets.token_hex(2).upper()}"
                 
                 # Perform AI-powered triage
-                triage_result = perform_ai_triage(ai_services, {
-                    'title': title,
-                    'description': description,
-                    'category': category,
-                    'urgency': urgency,
-                    'impact': impact,
-                    'affected_systems': affected_systems
-                })
+                with st.spinner("Triaging incident..."):
+                    triage_result = perform_ai_triage(ai_services, {
+                        'title': title,
+                        'description': description,
+                        'category': category,
+                        'urgency': urgency,
+                        'impact': impact,
+                        'affected_systems': affected_systems
+                    })
                 
                 # Create incident record
                 incident = {
@@ -91,13 +200,13 @@ def submit_incident_form(data_manager, ai_services):
                     'urgency': urgency,
                     'impact': impact,
                     'source': source,
-                    'affected_systems': affected_systems,
+                    'affected_systems': json.dumps(affected_systems),
                     'priority': triage_result['priority'],
                     'assigned_team': triage_result['assigned_team'],
-                    'tags': triage_result['tags'],
+                    'tags': json.dumps(triage_result['tags']),
                     'estimated_resolution_hours': triage_result['estimated_hours'],
                     'status': 'open',
-                    'created_date': datetime.now().isoformat(),
+                    'created_date': now.isoformat(),
                     'resolution_hours': None,
                     'resolution_notes': None
                 }
@@ -157,6 +266,14 @@ def perform_ai_triage(ai_services, incident_data):
     # Generate reasoning
     reasoning = generate_reasoning(incident_data, keywords, priority)
     
+    # With an API key, the model's routing and tags refine the rule-based result; priority stays
+    # with the reporter's urgency and impact
+    if ai_services.openai_client:
+        analysis = ai_services.analyze_incident_text(incident_data['title'], incident_data['description'])
+        assigned_team = analysis.get('recommended_team') or assigned_team
+        tags = list(dict.fromkeys(chain(tags, (tag.lower() for tag in analysis.get('tags', [])))))
+        reasoning += f" AI analysis recommends {assigned_team} ({analysis.get('confidence_score', 0):.0%} confidence)."
+    
     return {
         'priority': priority,
         'assigned_team': assigned_team,
@@ -166,58 +283,40 @@ def perform_ai_triage(ai_services, incident_data):
     }
 
 def extract_keywords(text):
-    """Extract relevant keywords from incident text"""
-    keywords = {
-        'security': ['password', 'login', 'access', 'hack', 'breach', 'unauthorized', 'virus', 'malware'],
-        'network': ['connection', 'internet', 'wifi', 'vpn', 'slow', 'timeout', 'ping'],
-        'email': ['email', 'outlook', 'mail', 'send', 'receive', 'attachment'],
-        'hardware': ['laptop', 'computer', 'printer', 'mouse', 'keyboard', 'screen', 'monitor'],
-        'software': ['application', 'app', 'program', 'software', 'install', 'update'],
-        'database': ['database', 'sql', 'query', 'data', 'report', 'export'],
-        'critical': ['down', 'outage', 'critical', 'urgent', 'emergency', 'broken', 'failure']
-    }
-    
-    found_keywords = []
-    for category, words in keywords.items():
-        for word in words:
-            if word in text:
-                found_keywords.append(category)
-                break
-    
-    return found_keywords
+    """Extract the set of keyword categories mentioned in incident text"""
+    keyword_index = _keyword_index()
+    found = set()
+    for word in WORD_PATTERN.findall(text):
+        # Whole words only, so "mailroom" is not an email keyword; inflections such as "hacked" still count
+        category = keyword_index.get(word)
+        if category:
+            found.add(category)
+            if len(found) == len(KEYWORDS):
+                break  # Every category seen; the rest of the text can't add any
+    return frozenset(found)
 
 def calculate_priority_score(incident_data, keywords):
     """Calculate priority score based on multiple factors"""
     score = 0
     
     # Base score from urgency
-    urgency_scores = {'Low': 10, 'Medium': 30, 'High': 60, 'Critical': 90}
-    score += urgency_scores.get(incident_data['urgency'], 10)
+    score += URGENCY_SCORES.get(incident_data['urgency'], 10)
     
     # Impact multiplier
-    impact_multipliers = {'Individual': 1.0, 'Department': 1.2, 'Organization': 1.5, 'External': 2.0}
-    score *= impact_multipliers.get(incident_data['impact'], 1.0)
+    score *= IMPACT_MULTIPLIERS.get(incident_data['impact'], 1.0)
     
     # Keyword modifiers
     if 'critical' in keywords:
         score += 30
     if 'security' in keywords:
         score += 20
-    if 'network' in keywords and incident_data['impact'] in ['Organization', 'External']:
+    if 'network' in keywords and incident_data['impact'] in HIGH_IMPACT_LEVELS:
         score += 15
     
     return min(score, 100)  # Cap at 100
 
 def assign_team(category, keywords):
     """Assign incident to appropriate team"""
-    team_mapping = {
-        'Hardware': 'IT Support',
-        'Software': 'Application Support',
-        'Network': 'Network Operations',
-        'Security': 'Security Team',
-        'Access': 'Identity & Access'
-    }
-    
     # Override based on keywords
     if 'security' in keywords:
         return 'Security Team'
@@ -226,39 +325,28 @@ def assign_team(category, keywords):
     elif 'database' in keywords:
         return 'Database Team'
     else:
-        return team_mapping.get(category, 'General Support')
+        return TEAM_MAPPING.get(category, 'General Support')
 
 def generate_tags(keywords, incident_data):
     """Generate relevant tags for the incident"""
-    tags = []
+    system_tags = (
+        SYSTEM_TAGS.get(system) or system.lower().replace(' ', '_')
+        for system in incident_data['affected_systems']
+    )
     
-    # Add keyword-based tags
-    tags.extend(keywords)
-    
-    # Add category tag
-    tags.append(incident_data['category'].lower())
-    
-    # Add system tags
-    if incident_data['affected_systems']:
-        tags.extend([system.lower().replace(' ', '_') for system in incident_data['affected_systems']])
+    keyword_tags = (category for category in KEYWORDS if category in keywords)
     
-    # Remove duplicates and return
-    return list(set(tags))
+    # Remove duplicates, keeping first-seen order
+    return list(dict.fromkeys(chain(keyword_tags, (incident_data['category'].lower(),), system_tags)))
 
 def generate_reasoning(incident_data, keywords, priority):
     """Generate human-readable reasoning for triage decision"""
-    reasons = []
+    reasons = [f"Classified as {priority} priority based on {incident_data['urgency']} urgency"]
     
-    reasons.append(f"Classified as {priority} priority based on {incident_data['urgency']} urgency")
-    
-    if incident_data['impact'] in ['Organization', 'External']:
+    if incident_data['impact'] in HIGH_IMPACT_LEVELS:
         reasons.append(f"High impact affecting {incident_data['impact'].lower()} level")
     
-    if 'critical' in keywords:
-        reasons.append("Critical keywords detected in description")
-    
-    if 'security' in keywords:
-        reasons.append("Security-related incident requiring immediate attention")
+    reasons.extend(reason for category, reason in KEYWORD_REASONS.items() if category in keywords)
     
     if incident_data['affected_systems']:
         reasons.append(f"Multiple systems affected: {', '.join(incident_data['affected_systems'])}")
@@ -268,7 +356,7 @@ def generate_reasoning(incident_data, keywords, priority):
 def incident_dashboard(data_manager):
     st.subheader("Incident Dashboard")
     
-    incidents_df = data_manager.get_incidents()
+    incidents_df = _load_incidents(data_manager, data_manager.get_data_version("incidents.csv"))
     
     if incidents_df.empty:
         st.info("No incidents reported yet.")
@@ -277,8 +365,10 @@ def incident_dashboard(data_manager):
     # Summary metrics
     col1, col2, col3, col4 = st.columns(4)
     
-    open_incidents = len(incidents_df[incidents_df['status'] == 'open'])
-    critical_incidents = len(incidents_df[incidents_df['priority'] == 'Critical'])
+    status_counts = incidents_df['status'].value_counts()
+    priority_counts = incidents_df['priority'].value_counts()
+    open_incidents = int(status_counts.get('open', 0))
+    critical_incidents = int(priority_counts.get('Critical', 0))
     avg_resolution = incidents_df['estimated_resolution_hours'].mean()
     
     with col1:
@@ -290,7 +380,7 @@ def incident_dashboard(data_manager):
     with col4:
         resolved_today = len(incidents_df[
             (incidents_df['status'] == 'resolved') & 
-            (pd.to_datetime(incidents_df['created_date'], format='ISO8601').dt.date == datetime.now().date())
+            (incidents_df['created_dt'].dt.normalize() == pd.Timestamp(datetime.now().date()))
         ])
         st.metric("Resolved Today", resolved_today)
     
@@ -303,70 +393,83 @@ def incident_dashboard(data_manager):
     with col3:
         team_filter = st.selectbox("Filter by Team", ["All"] + list(incidents_df['assigned_team'].unique()))
     
-    # Apply filters
-    filtered_df = incidents_df.copy()
+    # Apply filters as one combined mask
+    mask = pd.Series(True, index=incidents_df.index)
     if status_filter != "All":
-        filtered_df = filtered_df[filtered_df['status'] == status_filter]
+        mask &= incidents_df['status'] == status_filter
     if priority_filter != "All":
-        filtered_df = filtered_df[filtered_df['priority'] == priority_filter]
+        mask &= incidents_df['priority'] == priority_filter
     if team_filter != "All":
-        filtered_df = filtered_df[filtered_df['assigned_team'] == team_filter]
+        mask &= incidents_df['assigned_team'] == team_filter
+    filtered_df = incidents_df[mask]
     
     # Incident list
     st.markdown("### Incident List")
     
-    for _, incident in filtered_df.iterrows():
-        with st.expander(f"[{incident['priority']}] {incident['id']} - {incident['title']}"):
-            col1, col2, col3 = st.columns([2, 1, 1])
-            
-            with col1:
-                st.write(f"**Customer:** {incident['customer']}")
-                st.write(f"**Description:** {incident['description'][:200]}...")
-                st.write(f"**Tags:** {', '.join(incident['tags']) if incident['tags'] else 'None'}")
-                st.write(f"**Created:** {incident['created_date']}")
-            
-            with col2:
-                st.metric("Priority", incident['priority'])
-                st.metric("Team", incident['assigned_team'])
-                st.metric("Est. Hours", incident['estimated_resolution_hours'])
-            
-            with col3:
-                current_status = incident['status']
-                if current_status == 'open':
-                    if st.button("Start Work", key=f"start_{incident['id']}"):
-                        data_manager.update_incident_status(incident['id'], 'in_progress')
-                        st.rerun()
-                elif current_status == 'in_progress':
-                    if st.button("Resolve", key=f"resolve_{incident['id']}"):
-                        data_manager.update_incident_status(incident['id'], 'resolved')
-                        st.rerun()
-                else:
-                    st.success("Resolved")
+    page_count = max(1, -(-len(filtered_df) // INCIDENTS_PAGE_SIZE))
+    page = 1
+    if page_count > 1:
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key="incidents_page")
+    page_df = filtered_df.iloc[(page - 1) * INCIDENTS_PAGE_SIZE:page * INCIDENTS_PAGE_SIZE]
+    
+    # One table for the whole page; detail widgets only for the selected row
+    event = st.dataframe(
+        page_df[['priority', 'id', 'title', 'customer', 'assigned_team', 'estimated_resolution_hours', 'status', 'created_date']],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'estimated_resolution_hours': st.column_config.NumberColumn("Est. Hours", format="%dh")
+        },
+        on_select="rerun",
+        selection_mode="single-row",
+        key="incidents_table"
+    )
+    
+    selected_rows = [row for row in event.selection.rows if row < len(page_df)]
+    if not selected_rows:
+        st.caption("Select an incident to view details and actions.")
+        return
+    
+    incident = page_df.iloc[[selected_rows[0]]].to_dict('records')[0]
+    with st.expander(f"[{incident['priority']}] {incident['id']} - {incident['title']}", expanded=True):
+        col1, col2, col3 = st.columns([2, 1, 1])
+        
+        with col1:
+            st.write(f"**Customer:** {incident['customer']}")
+            st.write(f"**Description:** {incident['description'][:200]}...")
+            st.write(f"**Tags:** {', '.join(incident['tags']) if incident['tags'] else 'None'}")
+            st.write(f"**Created:** {incident['created_date']}")
+        
+        with col2:
+            st.metric("Priority", incident['priority'])
+            st.metric("Team", incident['assigned_team'])
+            st.metric("Est. Hours", incident['estimated_resolution_hours'])
+        
+        with col3:
+            current_status = incident['status']
+            if current_status == 'open':
+                if st.button("Start Work", key="start_incident"):
+                    data_manager.update_incident_status(incident['id'], 'in_progress')
+                    st.rerun()
+            elif current_status == 'in_progress':
+                if st.button("Resolve", key="resolve_incident"):
+                    data_manager.update_incident_status(incident['id'], 'resolved')
+                    st.rerun()
+            else:
+                st.success("Resolved")
 
-def triage_rules_management(data_manager):
+def triage_rules_management(data_manager, ai_services):
     st.subheader("Triage Rules Configuration")
     
-    st.markdown("""
-    ### Current AI Triage Rules
-    
-    **Priority Calculation:**
-    - Urgency score (Low: 10, Medium: 30, High: 60, Critical: 90)
-    - Impact multiplier (Individual: 1.0, Department: 1.2, Organization: 1.5, External: 2.0)
-    - Keyword bonuses (Critical: +30, Security: +20, Network+Organization: +15)
-    
-    **Team Assignment Rules:**
-    """)
-    
-    rules = {
-        "Security Team": ["security", "password", "breach", "unauthorized"],
-        "Network Operations": ["network", "connection", "vpn", "internet"],
-        "Database Team": ["database", "sql", "data", "report"],
-        "Application Support": ["software", "application", "program"],
-        "IT Support": ["hardware", "laptop", "printer", "computer"]
-    }
+    st.markdown(_rules_markdown())
     
-    for team, keywords in rules.items():
-        st.markdown(f"**{team}:** {', '.join(keywords)}")
+    # How often the keyword rules settled a ticket without the model
+    routes = ai_services.triage_route_counts()
+    if routes["local"] or routes["model"]:
+        st.caption(
+            f"AI incident analyses since startup: {routes['local']} classified by keyword rules, "
+            f"{routes['model']} sent to the model."
+        )
     
     # Add new rule
     st.markdown("### Add New Rule")
@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
@@ -7,6 +8,44 @@ import json
 
 st.set_page_config(page_title="Reporting", page_icon="📊", layout="wide")
 
+# Low-cardinality columns that the report counts and groups on
+USER_CATEGORICAL_COLUMNS = ('status', 'department')
+INCIDENT_CATEGORICAL_COLUMNS = ('status', 'priority', 'category', 'assigned_team')
+
+# Columns the report reads; a missing data file loads as a zero-row frame with these
+USER_REPORT_COLUMNS = USER_CATEGORICAL_COLUMNS + ('onboarding_progress',)
+INCIDENT_REPORT_COLUMNS = INCIDENT_CATEGORICAL_COLUMNS + ('created_date', 'estimated_resolution_hours')
+
+# Upper edges of the onboarding progress ranges; each range includes its upper edge
+PROGRESS_BIN_EDGES = np.array([25, 50, 75], dtype=np.float32)
+PROGRESS_BIN_LABELS = ['0-25%', '26-50%', '51-75%', '76-100%']
+
+# Incident trend spans longer than this are plotted weekly instead of daily
+MAX_DAILY_TREND_POINTS = 365
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_users(_data_manager, version):
+    """Load the users DataFrame, cached until users.csv changes on disk"""
+    users_df = _data_manager.get_users()
+    if users_df.empty:
+        users_df = pd.DataFrame(columns=USER_REPORT_COLUMNS)
+    users_df = users_df.astype({column: 'category' for column in USER_CATEGORICAL_COLUMNS})
+    # Progress is a 0-100 percentage, so float32 is plenty for the means and bins
+    users_df['onboarding_progress'] = users_df['onboarding_progress'].astype('float32')
+    return users_df
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_incidents(_data_manager, version):
+    """Load incidents with parsed dates and categorical columns, cached until incidents.csv changes on disk"""
+    incidents_df = _data_manager.get_incidents()
+    if incidents_df.empty:
+        incidents_df = pd.DataFrame(columns=INCIDENT_REPORT_COLUMNS)
+    # ISO8601 handles timestamps with or without microseconds
+    incidents_df['created_date'] = pd.to_datetime(incidents_df['created_date'], format='ISO8601', errors='coerce')
+    incidents_df = incidents_df.astype({column: 'category' for column in INCIDENT_CATEGORICAL_COLUMNS})
+    incidents_df['estimated_resolution_hours'] = incidents_df['estimated_resolution_hours'].astype('float32')
+    return incidents_df
+
 def main():
     st.title("📊 Reporting & Analytics")
     st.markdown("### AI-generated insights and executive dashboards")
@@ -19,7 +58,7 @@ def main():
     data_manager = st.session_state.data_manager
     ai_services = st.session_state.ai_services
     
-    # Tabs
+    # Tabs; each interactive tab is a fragment, so its widgets rerun only that tab
     tab1, tab2, tab3, tab4 = st.tabs(["Executive Dashboard", "Generate Report", "Analytics", "Demo Script"])
     
     with tab1:
@@ -34,13 +73,15 @@ def main():
     with tab4:
         show_demo_script()
 
+@st.fragment
 def executive_dashboard(data_manager):
     st.subheader("Executive Dashboard")
     
     # Load data
-    users_df = data_manager.get_users()
-    incidents_df = data_manager.get_incidents()
-    metrics_df = data_manager.get_metrics()
+    users_version = data_manager.get_data_version("users.csv")
+    incidents_version = data_manager.get_data_version("incidents.csv")
+    users_df = _load_users(data_manager, users_version)
+    incidents_df = _load_incidents(data_manager, incidents_version)
     
     # Time period selector
     col1, col2 = st.columns([3, 1])
@@ -50,41 +91,35 @@ def executive_dashboard(data_manager):
     # Key Performance Indicators
     st.markdown("### Key Performance Indicators")
     
+    kpis = _aggregate_report_data(data_manager, users_version, incidents_version)
+    
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_onboarding = len(users_df) if not users_df.empty else 0
-        completed_onboarding = len(users_df[users_df['status'] == 'completed']) if not users_df.empty else 0
-        completion_rate = (completed_onboarding / total_onboarding * 100) if total_onboarding > 0 else 0
         st.metric(
             "Onboarding Completion Rate",
-            f"{completion_rate:.1f}%",
+            f"{kpis['onboarding_completion_rate']:.1f}%",
             delta="5.2% vs last month"
         )
     
     with col2:
-        total_incidents = len(incidents_df) if not incidents_df.empty else 0
-        resolved_incidents = len(incidents_df[incidents_df['status'] == 'resolved']) if not incidents_df.empty else 0
-        resolution_rate = (resolved_incidents / total_incidents * 100) if total_incidents > 0 else 0
         st.metric(
             "Incident Resolution Rate",
-            f"{resolution_rate:.1f}%",
+            f"{kpis['resolution_rate']:.1f}%",
             delta="3.1% vs last month"
         )
     
     with col3:
-        avg_onboarding_time = users_df['onboarding_progress'].mean() if not users_df.empty else 0
         st.metric(
             "Avg Onboarding Time",
-            f"{avg_onboarding_time:.1f} days",
+            f"{kpis['avg_onboarding_progress']:.1f} days",
             delta="-1.2 days vs last month"
         )
     
     with col4:
-        avg_resolution_time = incidents_df['estimated_resolution_hours'].mean() if not incidents_df.empty else 0
         st.metric(
             "Avg Resolution Time",
-            f"{avg_resolution_time:.1f}h",
+            f"{kpis['avg_resolution_time']:.1f}h",
             delta="-2.3h vs last month"
         )
     
@@ -94,7 +129,7 @@ def executive_dashboard(data_manager):
     with col1:
         # Onboarding progress chart
         if not users_df.empty:
-            fig_onboarding = create_onboarding_chart(users_df)
+            fig_onboarding, dept_chart = _user_charts(users_df, users_version)
             st.plotly_chart(fig_onboarding, use_container_width=True)
         else:
             st.info("No onboarding data available")
@@ -102,7 +137,7 @@ def executive_dashboard(data_manager):
     with col2:
         # Incident trends chart
         if not incidents_df.empty:
-            fig_incidents = create_incident_trends_chart(incidents_df)
+            fig_incidents, priority_chart = _incident_charts(incidents_df, incidents_version)
             st.plotly_chart(fig_incidents, use_container_width=True)
         else:
             st.info("No incident data available")
@@ -112,14 +147,13 @@ def executive_dashboard(data_manager):
     
     with col1:
         if not users_df.empty:
-            dept_chart = create_department_chart(users_df)
             st.plotly_chart(dept_chart, use_container_width=True)
     
     with col2:
         if not incidents_df.empty:
-            priority_chart = create_priority_chart(incidents_df)
             st.plotly_chart(priority_chart, use_container_width=True)
 
+@st.fragment
 def generate_ai_report(data_manager, ai_services):
     st.subheader("AI-Generated Executive Report")
     
@@ -139,42 +173,99 @@ def generate_ai_report(data_manager, ai_services):
         )
     
     with col2:
-        audience = st.selectbox("Target Audience", ["C-Suite", "Department Heads", "Team Leads", "Board of Directors"])
+        audiences = st.multiselect(
+            "Target Audience",
+            ["C-Suite", "Department Heads", "Team Leads", "Board of Directors"],
+            default=["C-Suite"]
+        )
         format_type = st.selectbox("Format", ["Executive Summary", "Detailed Analysis", "Action Plan"])
     
     if st.button("Generate AI Report", type="primary"):
-        with st.spinner("Generating AI-powered insights..."):
-            # Collect data for analysis
-            report_data = collect_report_data(data_manager)
-            
-            # Generate AI summary
-            ai_summary = generate_ai_summary(ai_services, report_data, report_type, focus_areas, audience)
-            
-            # Display report
-            display_ai_report(ai_summary, report_data)
+        if not audiences:
+            st.error("Please select at least one target audience.")
+            return
+        
+        # Collect data for analysis
+        report_data = collect_report_data(data_manager)
+        
+        ai_summaries = None
+        if len(audiences) == 1 and ai_services.openai_client:
+            # Stream a single report so the user sees it being written
+            try:
+                ai_summaries = [stream_ai_summary(ai_services, report_data, report_type, focus_areas, audiences[0])]
+            except Exception as e:
+                st.warning(f"Streaming the report failed, generating it in one request instead: {e}")
+        
+        if ai_summaries is None:
+            with st.spinner("Generating AI-powered insights..."):
+                # Generate one AI summary per audience, batched into shared requests
+                ai_summaries = generate_ai_summary(ai_services, report_data, report_type, focus_areas, audiences)
+        
+        # Display reports
+        if len(audiences) == 1:
+            display_ai_report(ai_summaries[0], report_data)
+        else:
+            for audience, tab, ai_summary in zip(audiences, st.tabs(audiences), ai_summaries):
+                with tab:
+                    display_ai_report(ai_summary, report_data, key=audience)
 
 def collect_report_data(data_manager):
     """Collect and aggregate data for AI analysis"""
-    users_df = data_manager.get_users()
-    incidents_df = data_manager.get_incidents()
+    return _aggregate_report_data(
+        data_manager,
+        data_manager.get_data_version("users.csv"),
+        data_manager.get_data_version("incidents.csv")
+    )
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _aggregate_report_data(_data_manager, users_version, incidents_version):
+    """Report KPIs from one value_counts per column, cached until either file changes"""
+    users_df = _load_users(_data_manager, users_version)
+    incidents_df = _load_incidents(_data_manager, incidents_version)
+    
+    # The loaders guarantee the report columns, so empty frames need no special casing
+    user_statuses = users_df['status'].value_counts()
+    incident_statuses = incidents_df['status'].value_counts()
     
+    # max(..., 1) and nan_to_num turn the zero-row rates and means into 0
     return {
-        'total_employees': len(users_df) if not users_df.empty else 0,
-        'onboarding_completion_rate': (len(users_df[users_df['status'] == 'completed']) / len(users_df) * 100) if not users_df.empty and len(users_df) > 0 else 0,
-        'avg_onboarding_progress': users_df['onboarding_progress'].mean() if not users_df.empty else 0,
-        'total_incidents': len(incidents_df) if not incidents_df.empty else 0,
-        'critical_incidents': len(incidents_df[incidents_df['priority'] == 'Critical']) if not incidents_df.empty else 0,
-        'resolution_rate': (len(incidents_df[incidents_df['status'] == 'resolved']) / len(incidents_df) * 100) if not incidents_df.empty and len(incidents_df) > 0 else 0,
-        'avg_resolution_time': incidents_df['estimated_resolution_hours'].mean() if not incidents_df.empty else 0,
-        'department_distribution': users_df['department'].value_counts().to_dict() if not users_df.empty else {},
-        'incident_categories': incidents_df['category'].value_counts().to_dict() if not incidents_df.empty else {}
+        'total_employees': len(users_df),
+        'onboarding_completion_rate': user_statuses.get('completed', 0) / max(len(users_df), 1) * 100,
+        'avg_onboarding_progress': np.nan_to_num(users_df['onboarding_progress'].mean()),
+        'total_incidents': len(incidents_df),
+        'critical_incidents': int(incidents_df['priority'].value_counts().get('Critical', 0)),
+        'resolution_rate': incident_statuses.get('resolved', 0) / max(len(incidents_df), 1) * 100,
+        'avg_resolution_time': np.nan_to_num(incidents_df['estimated_resolution_hours'].mean()),
+        'department_distribution': users_df['department'].value_counts(sort=False).to_dict(),
+        'incident_categories': incidents_df['category'].value_counts(sort=False).to_dict()
     }
 
-def generate_ai_summary(ai_services, data, report_type, focus_areas, audience):
-    """Generate AI-powered executive summary"""
+def stream_ai_summary(ai_services, data, report_type, focus_areas, audience):
+    """Stream a single AI summary onto the page and return the parsed report"""
+    with st.status("Generating AI-powered insights...", expanded=True) as status:
+        content = st.write_stream(
+            ai_services.stream_executive_summary(format_data_summary(data), report_type, focus_areas, audience)
+        )
+        summary = json.loads(content)
+        status.update(label="AI insights generated", state="complete", expanded=False)
+    return summary
+
+def generate_ai_summary(ai_services, data, report_type, focus_areas, audiences):
+    """Generate an AI-powered executive summary for each audience"""
     
     # Prepare data summary for AI
-    data_summary = f"""
+    data_summary = format_data_summary(data)
+    
+    # Use AI to generate insights; AIServices caches real model output, never the fallback
+    try:
+        return ai_services.generate_executive_summaries(data_summary, report_type, focus_areas, audiences)
+    except Exception as e:
+        # Fallback summary if AI is not available
+        return [generate_fallback_summary(data, report_type, focus_areas) for _ in audiences]
+
+def format_data_summary(data):
+    """Format the aggregated report data as a prompt-ready summary"""
+    return f"""
     Operational Metrics Summary:
     - Total Employees: {data['total_employees']}
     - Onboarding Completion Rate: {data['onboarding_completion_rate']:.1f}%
@@ -186,14 +277,6 @@ def generate_ai_summary(ai_services, data, report_type, focus_areas, audience):
     - Department Distribution: {data['department_distribution']}
     - Incident Categories: {data['incident_categories']}
     """
-    
-    # Use AI to generate insights
-    try:
-        summary = ai_services.generate_executive_summary(data_summary, report_type, focus_areas, audience)
-        return summary
-    except Exception as e:
-        # Fallback summary if AI is not available
-        return generate_fallback_summary(data, report_type, focus_areas)
 
 def generate_fallback_summary(data, report_type, focus_areas):
     """Generate a structured summary when AI is not available"""
@@ -231,7 +314,7 @@ def generate_fallback_summary(data, report_type, focus_areas):
     
     return summary
 
-def display_ai_report(summary, data):
+def display_ai_report(summary, data, key="report"):
     """Display the generated AI report"""
     
     st.markdown("### 📋 Executive Summary")
@@ -269,201 +352,234 @@ def display_ai_report(summary, data):
         st.metric("Strategic Initiatives", "2", delta="Due this quarter")
     
     # Download report
-    if st.button("📄 Download Report"):
-        report_json = json.dumps(summary, indent=2)
-        st.download_button(
-            label="Download as JSON",
-            data=report_json,
-            file_name=f"crosspilot_report_{datetime.now().strftime('%Y%m%d')}.json",
-            mime="application/json"
-        )
+    # Serialized once per render; "ignore" keeps the report on screen after downloading
+    report_json = json.dumps(summary, indent=2, default=str)
+    st.download_button(
+        label="📄 Download Report",
+        data=report_json,
+        file_name=f"crosspilot_report_{datetime.now().strftime('%Y%m%d')}.json",
+        mime="application/json",
+        on_click="ignore",
+        key=f"download_{key}"
+    )
 
+@st.fragment
 def detailed_analytics(data_manager):
     st.subheader("Detailed Analytics")
     
-    users_df = data_manager.get_users()
-    incidents_df = data_manager.get_incidents()
+    users_version = data_manager.get_data_version("users.csv")
+    incidents_version = data_manager.get_data_version("incidents.csv")
+    users_df = _load_users(data_manager, users_version)
+    incidents_df = _load_incidents(data_manager, incidents_version)
     
     # Analytics sections
     st.markdown("### Onboarding Analytics")
     
     if not users_df.empty:
+        fig_dept, fig_status = _user_analytics_charts(users_df, users_version)
         col1, col2 = st.columns(2)
         
         with col1:
-            # Onboarding by department
-            dept_onboarding = users_df.groupby('department')['onboarding_progress'].mean()
-            fig_dept = px.bar(
-                x=dept_onboarding.index,
-                y=dept_onboarding.values,
-                title="Average Onboarding Progress by Department",
-                labels={'x': 'Department', 'y': 'Progress (%)'}
-            )
             st.plotly_chart(fig_dept, use_container_width=True)
         
         with col2:
-            # Onboarding status distribution
-            status_counts = users_df['status'].value_counts()
-            fig_status = px.pie(
-                values=status_counts.values,
-                names=status_counts.index,
-                title="Onboarding Status Distribution"
-            )
             st.plotly_chart(fig_status, use_container_width=True)
     
     st.markdown("### Incident Analytics")
     
     if not incidents_df.empty:
+        fig_team, fig_resolution = _incident_analytics_charts(incidents_df, incidents_version)
         col1, col2 = st.columns(2)
         
         with col1:
-            # Incidents by team
-            team_incidents = incidents_df['assigned_team'].value_counts()
-            fig_team = px.bar(
-                x=team_incidents.index,
-                y=team_incidents.values,
-                title="Incidents by Assigned Team",
-                labels={'x': 'Team', 'y': 'Number of Incidents'}
-            )
             st.plotly_chart(fig_team, use_container_width=True)
         
         with col2:
-            # Resolution time by priority
-            resolution_by_priority = incidents_df.groupby('priority')['estimated_resolution_hours'].mean()
-            fig_resolution = px.bar(
-                x=resolution_by_priority.index,
-                y=resolution_by_priority.values,
-                title="Average Resolution Time by Priority",
-                labels={'x': 'Priority', 'y': 'Hours'}
-            )
             st.plotly_chart(fig_resolution, use_container_width=True)
 
+# Figures are shared read-only across sessions; cache_resource skips the
+# pickle round trip, which costs more than rebuilding these small charts
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _user_charts(_users_df, version):
+    """Onboarding and department figures, rebuilt only when users.csv changes"""
+    return create_onboarding_chart(_users_df), create_department_chart(_users_df)
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _incident_charts(_incidents_df, version):
+    """Incident trend and priority figures, rebuilt only when incidents.csv changes"""
+    return create_incident_trends_chart(_incidents_df), create_priority_chart(_incidents_df)
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _user_analytics_charts(_users_df, version):
+    """Department progress and status figures, rebuilt only when users.csv changes"""
+    return create_department_progress_chart(_users_df), create_status_chart(_users_df)
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _incident_analytics_charts(_incidents_df, version):
+    """Team workload and resolution time figures, rebuilt only when incidents.csv changes"""
+    return create_team_chart(_incidents_df), create_resolution_time_chart(_incidents_df)
+
 def create_onboarding_chart(users_df):
     """Create onboarding progress chart"""
-    progress_bins = pd.cut(users_df['onboarding_progress'], bins=[0, 25, 50, 75, 100], labels=['0-25%', '26-50%', '51-75%', '76-100%'])
-    progress_counts = progress_bins.value_counts().sort_index()
-    
-    fig = px.bar(
-        x=progress_counts.index,
-        y=progress_counts.values,
-        title="Onboarding Progress Distribution",
-        labels={'x': 'Progress Range', 'y': 'Number of Employees'},
-        color=progress_counts.values,
-        color_continuous_scale='Viridis'
-    )
+    # Single vectorized pass: bin index per employee, then count per bin
+    progress = users_df['onboarding_progress'].dropna().to_numpy(dtype=np.float32)
+    progress_counts = np.bincount(
+        np.searchsorted(PROGRESS_BIN_EDGES, progress, side='left'),
+        minlength=len(PROGRESS_BIN_LABELS)
+    ).tolist()
+    
+    fig = go.Figure(go.Bar(
+        x=PROGRESS_BIN_LABELS,
+        y=progress_counts,
+        marker=dict(color=progress_counts, colorscale='Viridis', showscale=True)
+    ))
+    fig.update_layout(title="Onboarding Progress Distribution", xaxis_title='Progress Range', yaxis_title='Number of Employees')
     return fig
 
 def create_incident_trends_chart(incidents_df):
     """Create incident trends chart"""
-    # FIX: Use ISO8601 parsing to handle timestamps with or without microseconds
-    incidents_df['date'] = pd.to_datetime(
-        incidents_df['created_date'],
-        format='ISO8601',
-        errors='coerce'
-    ).dt.date
-    
-    daily_incidents = incidents_df.groupby('date').size().reset_index(name='count')
-    
-    fig = px.line(
-        daily_incidents,
-        x='date',
-        y='count',
-        title="Daily Incident Volume",
-        labels={'date': 'Date', 'count': 'Number of Incidents'}
-    )
+    # Daily bins on the datetime column; days without incidents count as zero
+    incident_volume = incidents_df.set_index('created_date').resample('D').size()
+    period = "Daily"
+    if len(incident_volume) > MAX_DAILY_TREND_POINTS:
+        # Long histories switch to weekly totals to keep the plotted series small
+        incident_volume = incident_volume.resample('W').sum()
+        period = "Weekly"
+    
+    fig = go.Figure(go.Scatter(x=incident_volume.index.tolist(), y=incident_volume.tolist(), mode='lines'))
+    fig.update_layout(title=f"{period} Incident Volume", xaxis_title='Date', yaxis_title='Number of Incidents')
     return fig
 
 def create_department_chart(users_df):
     """Create department distribution chart"""
     dept_counts = users_df['department'].value_counts()
     
-    fig = px.pie(
-        values=dept_counts.values,
-        names=dept_counts.index,
-        title="Employee Distribution by Department"
-    )
+    fig = go.Figure(go.Pie(labels=dept_counts.index.tolist(), values=dept_counts.tolist()))
+    fig.update_layout(title="Employee Distribution by Department")
     return fig
 
 def create_priority_chart(incidents_df):
     """Create incident priority chart"""
     priority_counts = incidents_df['priority'].value_counts()
-    
-    fig = px.bar(
-        x=priority_counts.index,
-        y=priority_counts.values,
-        title="Incidents by Priority Level",
-        labels={'x': 'Priority', 'y': 'Number of Incidents'},
-        color=priority_counts.index,
-        color_discrete_map={'Critical': 'red', 'High': 'orange', 'Medium': 'yellow', 'Low': 'green'}
-    )
+    color_map = {'Critical': 'red', 'High': 'orange', 'Medium': 'yellow', 'Low': 'green'}
+    
+    fig = go.Figure(go.Bar(
+        x=priority_counts.index.tolist(),
+        y=priority_counts.tolist(),
+        marker_color=[color_map.get(priority, 'gray') for priority in priority_counts.index]
+    ))
+    fig.update_layout(title="Incidents by Priority Level", xaxis_title='Priority', yaxis_title='Number of Incidents')
     return fig
 
+def create_department_progress_chart(users_df):
+    """Create average onboarding progress by department chart"""
+    dept_onboarding = users_df.groupby('department')['onboarding_progress'].mean()
+    return px.bar(
+        x=dept_onboarding.index,
+        y=dept_onboarding.values,
+        title="Average Onboarding Progress by Department",
+        labels={'x': 'Department', 'y': 'Progress (%)'}
+    )
+
+def create_status_chart(users_df):
+    """Create onboarding status distribution chart"""
+    status_counts = users_df['status'].value_counts()
+    return px.pie(
+        values=status_counts.values,
+        names=status_counts.index,
+        title="Onboarding Status Distribution"
+    )
+
+def create_team_chart(incidents_df):
+    """Create incidents by assigned team chart"""
+    team_incidents = incidents_df['assigned_team'].value_counts()
+    return px.bar(
+        x=team_incidents.index,
+        y=team_incidents.values,
+        title="Incidents by Assigned Team",
+        labels={'x': 'Team', 'y': 'Number of Incidents'}
+    )
+
+def create_resolution_time_chart(incidents_df):
+    """Create average resolution time by priority chart"""
+    resolution_by_priority = incidents_df.groupby('priority')['estimated_resolution_hours'].mean()
+    return px.bar(
+        x=resolution_by_priority.index,
+        y=resolution_by_priority.values,
+        title="Average Resolution Time by Priority",
+        labels={'x': 'Priority', 'y': 'Hours'}
+    )
+
+# Static demo copy, kept out of show_demo_script so the function stays a thin render
+DEMO_SCRIPT = """
+### 30-Second Demo Flow
+
+**Scenario:** Generating executive insights for monthly review
+
+**Script:**
+1. "Let me show you CrossPilot's AI-powered reporting capabilities"
+2. **Click 'Executive Dashboard' tab**
+3. "Here's our real-time operational dashboard with key metrics"
+4. "We can see onboarding completion rates, incident resolution trends, and performance by department"
+5. **Click 'Generate Report' tab**
+6. "Now I'll generate an AI-powered executive summary"
+7. **Select:**
+   - Report Type: "Monthly Analysis" 
+   - Focus Areas: "Onboarding Efficiency", "Incident Response"
+   - Audience: "C-Suite"
+8. **Click 'Generate AI Report'**
+9. "Watch as AI analyzes our data and generates actionable insights"
+10. "The report includes key findings, recommendations, and next steps"
+
+### Key Talking Points
+- **Real-time dashboards** - Live visibility into operational performance
+- **AI-powered insights** - Automated analysis identifies trends and opportunities
+- **Executive-ready reports** - Tailored summaries for different audiences
+- **Actionable recommendations** - Specific next steps for process improvement
+
+### Expected Report Output
+The AI will analyze current data and generate insights like:
+- Onboarding efficiency improvements
+- Incident response optimization opportunities
+- Resource allocation recommendations
+- Process automation ROI analysis
+"""
+
+SAMPLE_EXECUTIVE_SUMMARY = """
+**Monthly Analysis - Operational Performance Review**
+
+**Executive Summary:**
+CrossPilot has successfully streamlined our operational workflows, managing 47 employees and 23 incidents this month. 
+Our automated onboarding achieved an 89% completion rate, while incident response maintained a 2.3-hour average resolution time.
+
+**Key Insights:**
+• Onboarding efficiency improved 15% through automated checklist generation
+• Incident triage accuracy reached 94% with AI-powered classification
+• Cross-functional coordination reduced handoff delays by 40%
+• Employee satisfaction with onboarding process increased to 4.6/5
+
+**Recommendations:**
+• Expand automation to performance review processes
+• Implement predictive analytics for proactive incident prevention
+• Deploy CrossPilot to Finance and Legal departments
+• Enhance mobile accessibility for remote employees
+
+**Next Steps:**
+• Schedule stakeholder review meeting for Q2 expansion
+• Evaluate integration with existing HRIS and ITSM systems
+• Develop ROI metrics for executive presentation
+• Plan pilot program for additional use cases
+"""
+
 def show_demo_script():
     st.subheader("Demo Script - Reporting & Analytics")
-    
-    st.markdown("""
-    ### 30-Second Demo Flow
-    
-    **Scenario:** Generating executive insights for monthly review
-    
-    **Script:**
-    1. "Let me show you CrossPilot's AI-powered reporting capabilities"
-    2. **Click 'Executive Dashboard' tab**
-    3. "Here's our real-time operational dashboard with key metrics"
-    4. "We can see onboarding completion rates, incident resolution trends, and performance by department"
-    5. **Click 'Generate Report' tab**
-    6. "Now I'll generate an AI-powered executive summary"
-    7. **Select:**
-       - Report Type: "Monthly Analysis" 
-       - Focus Areas: "Onboarding Efficiency", "Incident Response"
-       - Audience: "C-Suite"
-    8. **Click 'Generate AI Report'**
-    9. "Watch as AI analyzes our data and generates actionable insights"
-    10. "The report includes key findings, recommendations, and next steps"
-    
-    ### Key Talking Points
-    - **Real-time dashboards** - Live visibility into operational performance
-    - **AI-powered insights** - Automated analysis identifies trends and opportunities
-    - **Executive-ready reports** - Tailored summaries for different audiences
-    - **Actionable recommendations** - Specific next steps for process improvement
-    
-    ### Expected Report Output
-    The AI will analyze current data and generate insights like:
-    - Onboarding efficiency improvements
-    - Incident response optimization opportunities
-    - Resource allocation recommendations
-    - Process automation ROI analysis
-    """)
+    st.markdown(DEMO_SCRIPT)
     
     # Sample report output
     st.markdown("### Sample AI-Generated Report")
     
     with st.expander("Sample Executive Summary"):
-        st.markdown("""
-        **Monthly Analysis - Operational Performance Review**
-        
-        **Executive Summary:**
-        CrossPilot has successfully streamlined our operational workflows, managing 47 employees and 23 incidents this month. 
-        Our automated onboarding achieved an 89% completion rate, while incident response maintained a 2.3-hour average resolution time.
-        
-        **Key Insights:**
-        • Onboarding efficiency improved 15% through automated checklist generation
-        • Incident triage accuracy reached 94% with AI-powered classification
-        • Cross-functional coordination reduced handoff delays by 40%
-        • Employee satisfaction with onboarding process increased to 4.6/5
-        
-        **Recommendations:**
-        • Expand automation to performance review processes
-        • Implement predictive analytics for proactive incident prevention
-        • Deploy CrossPilot to Finance and Legal departments
-        • Enhance mobile accessibility for remote employees
-        
-        **Next Steps:**
-        • Schedule stakeholder review meeting for Q2 expansion
-        • Evaluate integration with existing HRIS and ITSM systems
-        • Develop ROI metrics for executive presentation
-        • Plan pilot program for additional use cases
-        """)
+        st.markdown(SAMPLE_EXECUTIVE_SUMMARY)
 
 if __name__ == "__main__":
     main()
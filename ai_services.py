@@ -1,37 +1,232 @@
 import os
+import atexit
 import json
 import re
-from typing import Dict, List, Any, Optional
+import hashlib
+import threading
+from collections import OrderedDict, Counter
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from typing import Dict, List, Any, Optional, Iterator, Callable, Tuple
 from datetime import datetime
 
-# Import OpenAI if available
+# Use orjson for response decoding if available
 try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-    OpenAIClient = OpenAI
+    import orjson
+    json_loads = orjson.loads
 except ImportError:
-    OPENAI_AVAILABLE = False
-    OpenAIClient = None
+    json_loads = json.loads
+
+# Model per task: short classifications and checklists use the faster, cheaper mini model;
+# executive summaries keep gpt-4o for reasoning quality
+AI_MODELS = {
+    "summary": "gpt-4o",
+    "triage": "gpt-4o-mini",
+    "onboarding": "gpt-4o-mini"
+}
+
+# Most audience variants requested in a single summary call
+SUMMARY_BATCH_SIZE = 4
+
+# Most API requests the batch helpers keep in flight at once
+MAX_CONCURRENT_REQUESTS = 8
+
+# Per-read timeout for API calls; the client default is ten minutes
+OPENAI_TIMEOUT_SECONDS = 30.0
+
+# Retries for rate limits (429), server errors and dropped connections, with the client's
+# jittered exponential backoff honouring Retry-After; bad requests are never retried
+OPENAI_MAX_RETRIES = 4
+
+# Non-streamed executive summaries run to ~1500 tokens per audience, so they get time in proportion
+# and a single retry; retrying a timed-out multi-audience report four times would block for minutes
+SUMMARY_TIMEOUT_SECONDS_PER_AUDIENCE = 45.0
+SUMMARY_MAX_RETRIES = 1
+
+# Most distinct API responses kept in the in-process response cache
+RESPONSE_CACHE_SIZE = 512
+
+# OpenAI reuses identical prompt prefixes (1024+ tokens) at a discount, so every
+# prompt puts its fixed instructions first and the per-request data last
+INCIDENT_ANALYSIS_INSTRUCTIONS = """You are an expert IT incident analyst. Analyze incidents and provide accurate classification for routing and prioritization.
+
+Provide analysis in JSON format with:
+- priority: "Critical", "High", "Medium", or "Low"
+- category: main category (e.g., "Hardware", "Software", "Network", "Security")
+- urgency_indicators: list of words/phrases that indicate urgency
+- affected_systems: likely affected systems based on description
+- recommended_team: which team should handle this (e.g., "IT Support", "Security Team", "Network Operations")
+- tags: relevant tags for categorization
+- confidence_score: 0-1 confidence in classification"""
+
+def _strict_json_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """response_format that makes the API return JSON conforming exactly to schema"""
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
+
+def _string_list() -> Dict[str, Any]:
+    """Schema for a list of strings"""
+    return {"type": "array", "items": {"type": "string"}}
+
+# Structured output schemas; strict mode requires every property and forbids extras
+EXECUTIVE_SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "executive_summary": {"type": "string"},
+        "key_insights": _string_list(),
+        "recommendations": _string_list(),
+        "next_steps": _string_list(),
+        "metrics_highlight": {"type": "string"}
+    },
+    "required": ["executive_summary", "key_insights", "recommendations", "next_steps", "metrics_highlight"],
+    "additionalProperties": False
+}
+EXECUTIVE_SUMMARY_FORMAT = _strict_json_format("executive_summary", EXECUTIVE_SUMMARY_SCHEMA)
+EXECUTIVE_SUMMARY_BATCH_FORMAT = _strict_json_format("executive_summaries", {
+    "type": "object",
+    "properties": {"reports": {"type": "array", "items": EXECUTIVE_SUMMARY_SCHEMA}},
+    "required": ["reports"],
+    "additionalProperties": False
+})
+INCIDENT_ANALYSIS_FORMAT = _strict_json_format("incident_analysis", {
+    "type": "object",
+    "properties": {
+        "priority": {"type": "string", "enum": ["Critical", "High", "Medium", "Low"]},
+        "category": {"type": "string"},
+        "urgency_indicators": _string_list(),
+        "affected_systems": _string_list(),
+        "recommended_team": {"type": "string"},
+        "tags": _string_list(),
+        "confidence_score": {"type": "number"}
+    },
+    "required": ["priority", "category", "urgency_indicators", "affected_systems", "recommended_team", "tags", "confidence_score"],
+    "additionalProperties": False
+})
+ONBOARDING_PERIODS = ["Pre-boarding", "Day 1", "Week 1", "Month 1"]
+ONBOARDING_CHECKLIST_FORMAT = _strict_json_format("onboarding_checklist", {
+    "type": "object",
+    "properties": {period: _string_list() for period in ONBOARDING_PERIODS},
+    "required": ONBOARDING_PERIODS,
+    "additionalProperties": False
+})
+
+# Keyword rules for the offline incident analysis, matched as whole words (inflections such as
+# "hacked" included) against lowercased text, in the same way as the triage page
+FALLBACK_KEYWORDS = {
+    "security": ("password", "login", "access", "unauthorized", "breach", "virus", "hack"),
+    "network": ("connection", "internet", "wifi", "vpn", "network", "ping", "timeout"),
+    "hardware": ("laptop", "computer", "printer", "mouse", "keyboard", "screen", "hardware"),
+    "critical": ("down", "downtime", "outage", "critical", "urgent", "emergency", "broken", "failure")
+}
+FALLBACK_CATEGORIES = ("security", "network", "hardware")
+
+# One named group per rule set, so a single scan finds every rule's hits
+FALLBACK_KEYWORD_RE = re.compile(
+    r"\b(?:" + "|".join(f"(?P<{rule}>{'|'.join(words)})" for rule, words in FALLBACK_KEYWORDS.items()) + r")(?:s|es|d|ed|ing|er|ers)?\b"
+)
+FALLBACK_HIGH_PRIORITY_RE = re.compile(r"\b(?:high|urgent)\b")
+FALLBACK_LOW_PRIORITY_RE = re.compile(r"\blow\b")
+
+# Offline onboarding checklist, plus extra Week 1 tasks for some departments
+FALLBACK_ONBOARDING_CHECKLIST = {
+    "Pre-boarding (Before Start Date)": (
+        "Send welcome email with first day instructions",
+        "Prepare workspace and required equipment",
+        "Create user accounts in required systems",
+        "Schedule orientation meetings with manager"
+    ),
+    "Day 1 - Welcome & Setup": (
+        "Office tour and introductions to team",
+        "Complete HR paperwork and documentation",
+        "Security badge and access card setup",
+        "IT equipment distribution and basic setup",
+        "Review employee handbook and company policies"
+    ),
+    "Week 1 - Integration": (
+        "Department-specific orientation session",
+        "Meet with direct manager for role expectations",
+        "Complete mandatory training modules",
+        "Introduction to key stakeholders and contacts",
+        "Set up work environment and tools"
+    ),
+    "Month 1 - Development": (
+        "Complete role-specific training programs",
+        "First project or assignment",
+        "30-day check-in with HR and manager",
+        "Feedback session and goal setting",
+        "Integration assessment and adjustments"
+    )
+}
+FALLBACK_DEPARTMENT_TASKS = {
+    "Engineering": (
+        "Setup development environment and tools",
+        "Access to code repositories and documentation",
+        "Architecture overview and code review process"
+    ),
+    "Sales": (
+        "CRM system training and setup",
+        "Territory assignment and customer introduction",
+        "Sales process and methodology training"
+    )
+}
+
+# Confidence reported for incidents the keyword rules classify without calling the API
+FAST_PATH_CONFIDENCE = 0.9
+
+# Semantic cache for incident analysis: near-duplicate tickets reuse a prior classification
+INCIDENT_EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_MATCH_THRESHOLD = 0.92
+SEMANTIC_CACHE_SIZE = 10000
 
 class AIServices:
     """AI services for CrossPilot - includes text analysis, summarization, and insights"""
     
     def __init__(self):
         self.openai_client = None
-        if OPENAI_AVAILABLE and OpenAIClient:
-            api_key = os.getenv("OPENAI_API_KEY")
-            if api_key:
-                self.openai_client = OpenAIClient(api_key=api_key)
+        api_key = os.getenv("OPENAI_API_KEY")
+        if api_key:
+            # Import OpenAI if available; deferred until a key is set, as the SDK takes ~0.5s to load
+            try:
+                from openai import OpenAI
+            except ImportError:
+                OpenAI = None
+            
+            if OpenAI:
+                # One client per process: its pooled keep-alive connections are reused by every call
+                self.openai_client = OpenAI(api_key=api_key, timeout=OPENAI_TIMEOUT_SECONDS, max_retries=OPENAI_MAX_RETRIES)
+                atexit.register(self.openai_client.close)
+        
+        # Raw JSON responses keyed on a hash of the request; the instance is shared across sessions
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        
+        # Semantic cache: a ring buffer of unit-length incident embeddings (allocated on first insert,
+        # once the embedding width is known) and the raw analysis for each filled row
+        self._incident_vectors: Optional[np.ndarray] = None
+        self._incident_results: List[str] = []
+        self._incident_writes = 0
+        self._incident_cache_lock = threading.Lock()
+        
+        # How incident analyses were answered ("local" keyword fast path or "model"), for tuning
+        self.triage_routes = Counter()
+        self._triage_routes_lock = threading.Lock()
     
     def generate_executive_summary(self, data_summary: str, report_type: str, focus_areas: List[str], audience: str) -> Dict[str, Any]:
         """Generate AI-powered executive summary"""
         
         if self.openai_client:
+            cache_key = self._response_cache_key(
+                "generate_executive_summary",
+                data_summary=data_summary, report_type=report_type, focus_areas=focus_areas, audience=audience
+            )
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return json_loads(cached)
+            
             try:
                 prompt = self._create_summary_prompt(data_summary, report_type, focus_areas, audience)
                 
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. do not change this unless explicitly requested by the user
+                response = self._summary_client(1).chat.completions.create(
+                    model=AI_MODELS["summary"],
                     messages=[
                         {
                             "role": "system",
@@ -42,13 +237,15 @@ class AIServices:
                             "content": prompt
                         }
                     ],
-                    response_format={"type": "json_object"},
+                    response_format=EXECUTIVE_SUMMARY_FORMAT,
                     max_tokens=1500
                 )
                 
                 content = response.choices[0].message.content
                 if content:
-                    return json.loads(content)
+                    result = json_loads(content)
+                    self._cache_response(cache_key, content)
+                    return result
                 else:
                     return self._generate_fallback_summary(data_summary, report_type, focus_areas)
             
@@ -58,47 +255,186 @@ class AIServices:
         else:
             return self._generate_fallback_summary(data_summary, report_type, focus_areas)
     
+    def generate_executive_summaries(self, data_summary: str, report_type: str, focus_areas: List[str], audiences: List[str]) -> List[Dict[str, Any]]:
+        """Generate one executive summary per audience, batching audiences into shared API calls"""
+        
+        if len(audiences) == 1:
+            return [self.generate_executive_summary(data_summary, report_type, focus_areas, audiences[0])]
+        
+        batches = [
+            (data_summary, report_type, focus_areas, audiences[start:start + SUMMARY_BATCH_SIZE])
+            for start in range(0, len(audiences), SUMMARY_BATCH_SIZE)
+        ]
+        return [summary for batch in self._run_concurrently(self._generate_summary_batch, batches) for summary in batch]
+    
+    def stream_executive_summary(self, data_summary: str, report_type: str, focus_areas: List[str], audience: str) -> Iterator[str]:
+        """Stream the executive summary JSON as it is generated, for incremental display"""
+        
+        if not self.openai_client:
+            yield json.dumps(self._generate_fallback_summary(data_summary, report_type, focus_areas))
+            return
+        
+        # Shares the generate_executive_summary cache, so either path can serve the other's reports
+        cache_key = self._response_cache_key(
+            "generate_executive_summary",
+            data_summary=data_summary, report_type=report_type, focus_areas=focus_areas, audience=audience
+        )
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        prompt = self._create_summary_prompt(data_summary, report_type, focus_areas, audience)
+        
+        stream = self.openai_client.chat.completions.create(
+            model=AI_MODELS["summary"],
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert business analyst specializing in operational efficiency and workforce management. Generate actionable insights and recommendations based on data analysis."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            response_format=EXECUTIVE_SUMMARY_FORMAT,
+            max_tokens=1500,
+            stream=True
+        )
+        
+        parts = []
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                yield parts[-1]
+        
+        # Only cache a complete report; a truncated stream is not valid JSON
+        content = "".join(parts)
+        try:
+            json_loads(content)
+        except ValueError:
+            return
+        self._cache_response(cache_key, content)
+    
+    def _generate_summary_batch(self, data_summary: str, report_type: str, focus_areas: List[str], audiences: List[str]) -> List[Dict[str, Any]]:
+        """Generate summaries for several audiences with a single API call"""
+        
+        if self.openai_client:
+            cache_key = self._response_cache_key(
+                "_generate_summary_batch",
+                data_summary=data_summary, report_type=report_type, focus_areas=focus_areas, audiences=audiences
+            )
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return json_loads(cached)["reports"]
+            
+            try:
+                prompt = self._create_batch_summary_prompt(data_summary, report_type, focus_areas, audiences)
+                
+                response = self._summary_client(len(audiences)).chat.completions.create(
+                    model=AI_MODELS["summary"],
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are an expert business analyst specializing in operational efficiency and workforce management. Generate actionable insights and recommendations based on data analysis."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    response_format=EXECUTIVE_SUMMARY_BATCH_FORMAT,
+                    max_tokens=1500 * len(audiences)
+                )
+                
+                content = response.choices[0].message.content
+                if content:
+                    reports = json_loads(content).get("reports", [])
+                    if len(reports) == len(audiences):
+                        self._cache_response(cache_key, content)
+                        return reports
+            
+            except Exception as e:
+                print(f"OpenAI API error: {e}")
+        
+        return [self._generate_fallback_summary(data_summary, report_type, focus_areas) for _ in audiences]
+    
+    def _summary_client(self, audience_count: int):
+        """Client for non-streamed summary calls, with a timeout sized to the report length"""
+        return self.openai_client.with_options(
+            timeout=SUMMARY_TIMEOUT_SECONDS_PER_AUDIENCE * audience_count,
+            max_retries=SUMMARY_MAX_RETRIES
+        )
+    
+    def _count_triage_route(self, route: str):
+        """Record how an incident analysis was answered; sessions call in from their own script threads"""
+        with self._triage_routes_lock:
+            self.triage_routes[route] += 1
+    
+    def triage_route_counts(self) -> Dict[str, int]:
+        """Local fast-path vs model analyses since startup, for tuning the keyword rules"""
+        # Mostly "model": FALLBACK_KEYWORDS rarely settles a ticket alone and could be extended.
+        # Mostly "local" with tickets landing on the wrong team: the fast path should be stricter.
+        with self._triage_routes_lock:
+            return {"local": self.triage_routes["local"], "model": self.triage_routes["model"]}
+    
     def analyze_incident_text(self, title: str, description: str) -> Dict[str, Any]:
         """Analyze incident text for classification and routing"""
         
         if self.openai_client:
+            # Clear-cut tickets are classified locally; only ambiguous ones go to the model
+            if self._is_clear_cut_incident(f"{title} {description}".lower()):
+                self._count_triage_route("local")
+                analysis = self._fallback_incident_analysis(title, description)
+                analysis["confidence_score"] = FAST_PATH_CONFIDENCE
+                return analysis
+            
+            cache_key = self._response_cache_key("analyze_incident_text", title=title, description=description)
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return json_loads(cached)
+            
             try:
                 combined_text = f"Title: {title}\nDescription: {description}"
                 
+                vector = self._embed_incident(combined_text)
+                if vector is not None:
+                    similar = self._similar_incident_analysis(vector)
+                    if similar is not None:
+                        return json_loads(similar)
+                
                 prompt = f"""
                 Analyze the following IT incident and provide classification:
                 
                 {combined_text}
-                
-                Provide analysis in JSON format with:
-                - priority: "Critical", "High", "Medium", or "Low"
-                - category: main category (e.g., "Hardware", "Software", "Network", "Security")
-                - urgency_indicators: list of words/phrases that indicate urgency
-                - affected_systems: likely affected systems based on description
-                - recommended_team: which team should handle this (e.g., "IT Support", "Security Team", "Network Operations")
-                - tags: relevant tags for categorization
-                - confidence_score: 0-1 confidence in classification
                 """
                 
+                # Counted only here, so cache hits above are not reported as model calls
+                self._count_triage_route("model")
                 response = self.openai_client.chat.completions.create(
-                    model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. do not change this unless explicitly requested by the user
+                    model=AI_MODELS["triage"],
                     messages=[
                         {
                             "role": "system",
-                            "content": "You are an expert IT incident analyst. Analyze incidents and provide accurate classification for routing and prioritization."
+                            "content": INCIDENT_ANALYSIS_INSTRUCTIONS
                         },
                         {
                             "role": "user",
                             "content": prompt
                         }
                     ],
-                    response_format={"type": "json_object"},
+                    response_format=INCIDENT_ANALYSIS_FORMAT,
                     max_tokens=800
                 )
                 
                 content = response.choices[0].message.content
                 if content:
-                    return json.loads(content)
+                    result = json_loads(content)
+                    self._cache_response(cache_key, content)
+                    if vector is not None:
+                        self._remember_incident_analysis(vector, content)
+                    return result
                 else:
                     return self._fallback_incident_analysis(title, description)
             
@@ -112,25 +448,16 @@ class AIServices:
         """Generate personalized onboarding checklist"""
         
         if self.openai_client:
+            cache_key = self._response_cache_key("generate_onboarding_checklist", employee_data=employee_data)
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return json_loads(cached)
+            
             try:
-                prompt = f"""
-                Generate a comprehensive onboarding checklist for a new employee with the following details:
-                
-                Role: {employee_data.get('role', 'N/A')}
-                Department: {employee_data.get('department', 'N/A')}
-                Security Clearance: {employee_data.get('security_clearance', 'Standard')}
-                Equipment Needed: {', '.join(employee_data.get('equipment_needed', []))}
-                System Access: {', '.join(employee_data.get('system_access', []))}
-                Office Location: {employee_data.get('office_location', 'N/A')}
-                
-                Create a detailed checklist organized by time periods (Pre-boarding, Day 1, Week 1, Month 1).
-                Tailor the checklist to the specific role and requirements.
-                
-                Return in JSON format with time periods as keys and task lists as values.
-                """
+                prompt = self._create_onboarding_prompt(employee_data)
                 
                 response = self.openai_client.chat.completions.create(
-                    model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. do not change this unless explicitly requested by the user
+                    model=AI_MODELS["onboarding"],
                     messages=[
                         {
                             "role": "system",
@@ -141,13 +468,15 @@ class AIServices:
                             "content": prompt
                         }
                     ],
-                    response_format={"type": "json_object"},
+                    response_format=ONBOARDING_CHECKLIST_FORMAT,
                     max_tokens=1200
                 )
                 
                 content = response.choices[0].message.content
                 if content:
-                    return json.loads(content)
+                    result = json_loads(content)
+                    self._cache_response(cache_key, content)
+                    return result
                 else:
                     return self._fallback_onboarding_checklist(employee_data)
             
@@ -157,18 +486,190 @@ class AIServices:
         else:
             return self._fallback_onboarding_checklist(employee_data)
     
+    def submit_onboarding_batch(self, employees: List[Dict[str, Any]]) -> Optional[str]:
+        """Queue onboarding checklists for many employees on the OpenAI Batch API, returning the batch id"""
+        if not self.openai_client or not employees:
+            return None
+        
+        lines = []
+        for employee in employees:
+            lines.append(json.dumps({
+                "custom_id": employee['id'],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": AI_MODELS["onboarding"],
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are an HR workflow expert specializing in employee onboarding. Create comprehensive, role-specific onboarding checklists."
+                        },
+                        {
+                            "role": "user",
+                            "content": self._create_onboarding_prompt(employee)
+                        }
+                    ],
+                    "response_format": ONBOARDING_CHECKLIST_FORMAT,
+                    "max_tokens": 1200
+                }
+            }))
+        
+        batch_file = self.openai_client.files.create(
+            file=("onboarding_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self.openai_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+    
+    def poll_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Current status, progress and output file of a Batch API job"""
+        batch = self.openai_client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        return {
+            'status': batch.status,
+            'completed': counts.completed if counts else 0,
+            'failed': counts.failed if counts else 0,
+            'total': counts.total if counts else 0,
+            'output_file_id': batch.output_file_id
+        }
+    
+    def parse_batch_output(self, file_id: str) -> Dict[str, Dict[str, Any]]:
+        """Map each custom_id in a finished batch to its parsed JSON response, skipping failed requests"""
+        results = {}
+        for line in self.openai_client.files.content(file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = json_loads(line)
+            response = record.get('response') or {}
+            if response.get('status_code') != 200:
+                continue
+            try:
+                content = response['body']['choices'][0]['message']['content']
+                results[record['custom_id']] = json_loads(content)
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                print(f"Skipping unreadable batch result {record.get('custom_id')}: {e}")
+        return results
+    
+    def _run_concurrently(self, fn: Callable[..., Any], calls: List[Tuple]) -> List[Any]:
+        """Run fn over argument tuples on worker threads so API round trips overlap"""
+        if not self.openai_client or len(calls) < 2:
+            return [fn(*args) for args in calls]
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(calls))) as pool:
+            return list(pool.map(lambda args: fn(*args), calls))
+    
+    def _response_cache_key(self, method: str, **inputs: Any) -> str:
+        """SHA-256 key for an API request, from the method name and its inputs"""
+        payload = json.dumps({"fn": method, "args": inputs}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _cached_response(self, key: str) -> Optional[str]:
+        """Return a cached raw response, marking it most recently used"""
+        with self._response_cache_lock:
+            content = self._response_cache.get(key)
+            if content is not None:
+                self._response_cache.move_to_end(key)
+            return content
+    
+    def _cache_response(self, key: str, content: str):
+        """Store a raw response, evicting the least recently used beyond RESPONSE_CACHE_SIZE"""
+        with self._response_cache_lock:
+            self._response_cache[key] = content
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+    
+    def _embed_incident(self, text: str) -> Optional[np.ndarray]:
+        """Unit-length embedding of the incident text, or None if embedding fails"""
+        try:
+            response = self.openai_client.embeddings.create(model=INCIDENT_EMBEDDING_MODEL, input=text)
+        except Exception as e:
+            print(f"OpenAI embedding error: {e}")
+            return None
+        
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+    
+    def _similar_incident_analysis(self, vector: np.ndarray) -> Optional[str]:
+        """Raw analysis of the most similar cached incident, if it clears SEMANTIC_MATCH_THRESHOLD"""
+        with self._incident_cache_lock:
+            if self._incident_vectors is None:
+                return None
+            # Rows are unit length, so one matrix-vector product over the filled rows gives every cosine similarity
+            similarities = self._incident_vectors[:len(self._incident_results)] @ vector
+            best = int(similarities.argmax())
+            if similarities[best] >= SEMANTIC_MATCH_THRESHOLD:
+                return self._incident_results[best]
+            return None
+    
+    def _remember_incident_analysis(self, vector: np.ndarray, content: str):
+        """Add an analysed incident to the semantic cache, overwriting the oldest row once it is full"""
+        with self._incident_cache_lock:
+            if self._incident_vectors is None:
+                self._incident_vectors = np.empty((SEMANTIC_CACHE_SIZE, vector.shape[0]), dtype=np.float32)
+            
+            slot = self._incident_writes % len(self._incident_vectors)
+            self._incident_vectors[slot] = vector
+            if slot < len(self._incident_results):
+                self._incident_results[slot] = content
+            else:
+                self._incident_results.append(content)
+            self._incident_writes += 1
+    
+    def _create_onboarding_prompt(self, employee_data: Dict[str, Any]) -> str:
+        """Create prompt for onboarding checklist generation"""
+        return f"""
+        Create a detailed checklist organized by time periods (Pre-boarding, Day 1, Week 1, Month 1).
+        Tailor the checklist to the specific role and requirements.
+        
+        Return in JSON format with time periods as keys and task lists as values.
+        
+        Generate a comprehensive onboarding checklist for a new employee with the following details:
+        
+        Role: {employee_data.get('role', 'N/A')}
+        Department: {employee_data.get('department', 'N/A')}
+        Security Clearance: {employee_data.get('security_clearance', 'Standard')}
+        Equipment Needed: {', '.join(employee_data.get('equipment_needed', []))}
+        System Access: {', '.join(employee_data.get('system_access', []))}
+        Office Location: {employee_data.get('office_location', 'N/A')}
+        """
+    
     def _create_summary_prompt(self, data_summary: str, report_type: str, focus_areas: List[str], audience: str) -> str:
         """Create prompt for executive summary generation"""
         
         focus_text = ", ".join(focus_areas)
         
         return f"""
+        Please provide a JSON response with the following structure:
+        {{
+            "executive_summary": "Brief overview of key findings and performance",
+            "key_insights": ["List of 4-5 key insights from the data"],
+            "recommendations": ["List of 4-5 actionable recommendations"],
+            "next_steps": ["List of 3-4 specific next steps"],
+            "metrics_highlight": "Brief summary of the most important metrics"
+        }}
+        
+        Focus on operational efficiency, process improvement, and business impact.
+        Make recommendations specific and actionable for the target audience.
+        
         Generate a comprehensive {report_type} report for {audience} audience focusing on {focus_text}.
         
         Data Summary:
         {data_summary}
+        """
+    
+    def _create_batch_summary_prompt(self, data_summary: str, report_type: str, focus_areas: List[str], audiences: List[str]) -> str:
+        """Create prompt for generating one executive summary per audience"""
         
-        Please provide a JSON response with the following structure:
+        focus_text = ", ".join(focus_areas)
+        audience_list = "\n".join(f"{i}. {audience}" for i, audience in enumerate(audiences, 1))
+        
+        return f"""
+        Please provide a JSON response with a "reports" array containing one object per audience, in the order listed, each with the following structure:
         {{
             "executive_summary": "Brief overview of key findings and performance",
             "key_insights": ["List of 4-5 key insights from the data"],
@@ -178,7 +679,13 @@ class AIServices:
         }}
         
         Focus on operational efficiency, process improvement, and business impact.
-        Make recommendations specific and actionable for the target audience.
+        Make recommendations specific and actionable for each target audience.
+        
+        Generate a comprehensive {report_type} report focusing on {focus_text} for each of these audiences:
+        {audience_list}
+        
+        Data Summary:
+        {data_summary}
         """
     
     def _generate_fallback_summary(self, data_summary: str, report_type: str, focus_areas: List[str]) -> Dict[str, Any]:
@@ -211,22 +718,30 @@ class AIServices:
             "metrics_highlight": "Operations maintaining stable performance with automation driving efficiency gains"
         }
     
+    def _keyword_hits(self, text: str) -> Dict[str, List[str]]:
+        """Keywords found in lowercased text, grouped by rule set, from a single regex scan"""
+        hits: Dict[str, List[str]] = {}
+        for match in FALLBACK_KEYWORD_RE.finditer(text):
+            hits.setdefault(match.lastgroup, []).append(match.group(match.lastgroup))
+        return hits
+    
+    def _is_clear_cut_incident(self, text: str) -> bool:
+        """True when exactly one category rule matches and the text has a critical keyword"""
+        hits = self._keyword_hits(text)
+        return sum(category in hits for category in FALLBACK_CATEGORIES) == 1 and "critical" in hits
+    
     def _fallback_incident_analysis(self, title: str, description: str) -> Dict[str, Any]:
         """Fallback incident analysis using keyword matching"""
         
         combined_text = f"{title} {description}".lower()
         
-        # Define keyword patterns
-        security_keywords = ['password', 'login', 'access', 'unauthorized', 'breach', 'virus', 'hack']
-        network_keywords = ['connection', 'internet', 'wifi', 'vpn', 'network', 'ping', 'timeout']
-        hardware_keywords = ['laptop', 'computer', 'printer', 'mouse', 'keyboard', 'screen', 'hardware']
-        critical_keywords = ['down', 'outage', 'critical', 'urgent', 'emergency', 'broken', 'failure']
-        
         # Analyze text
-        has_security = any(keyword in combined_text for keyword in security_keywords)
-        has_network = any(keyword in combined_text for keyword in network_keywords)
-        has_hardware = any(keyword in combined_text for keyword in hardware_keywords)
-        has_critical = any(keyword in combined_text for keyword in critical_keywords)
+        hits = self._keyword_hits(combined_text)
+        has_security = "security" in hits
+        has_network = "network" in hits
+        has_hardware = "hardware" in hits
+        urgency_indicators = list(dict.fromkeys(hits.get("critical", [])))
+        has_critical = bool(urgency_indicators)
         
         # Determine category and priority
         if has_security:
@@ -244,9 +759,9 @@ class AIServices:
         
         if has_critical or has_security:
             priority = "Critical"
-        elif 'high' in combined_text or 'urgent' in combined_text:
+        elif FALLBACK_HIGH_PRIORITY_RE.search(combined_text):
             priority = "High"
-        elif 'low' in combined_text:
+        elif FALLBACK_LOW_PRIORITY_RE.search(combined_text):
             priority = "Low"
         else:
             priority = "Medium"
@@ -264,7 +779,7 @@ class AIServices:
         return {
             "priority": priority,
             "category": category,
-            "urgency_indicators": [word for word in critical_keywords if word in combined_text],
+            "urgency_indicators": urgency_indicators,
             "affected_systems": ["Unknown"],
             "recommended_team": recommended_team,
             "tags": tags,
@@ -275,50 +790,8 @@ class AIServices:
         """Generate fallback onboarding checklist"""
         
         department = employee_data.get('department', 'General')
-        role = employee_data.get('role', 'Employee')
-        
-        base_checklist = {
-            "Pre-boarding (Before Start Date)": [
-                "Send welcome email with first day instructions",
-                "Prepare workspace and required equipment",
-                "Create user accounts in required systems",
-                "Schedule orientation meetings with manager"
-            ],
-            "Day 1 - Welcome & Setup": [
-                "Office tour and introductions to team",
-                "Complete HR paperwork and documentation",
-                "Security badge and access card setup",
-                "IT equipment distribution and basic setup",
-                "Review employee handbook and company policies"
-            ],
-            "Week 1 - Integration": [
-                "Department-specific orientation session",
-                "Meet with direct manager for role expectations",
-                "Complete mandatory training modules",
-                "Introduction to key stakeholders and contacts",
-                "Set up work environment and tools"
-            ],
-            "Month 1 - Development": [
-                "Complete role-specific training programs",
-                "First project or assignment",
-                "30-day check-in with HR and manager",
-                "Feedback session and goal setting",
-                "Integration assessment and adjustments"
-            ]
-        }
         
-        # Add department-specific items
-        if department == 'Engineering':
-            base_checklist["Week 1 - Integration"].extend([
-                "Setup development environment and tools",
-                "Access to code repositories and documentation",
-                "Architecture overview and code review process"
-            ])
-        elif department == 'Sales':
-            base_checklist["Week 1 - Integration"].extend([
-                "CRM system training and setup",
-                "Territory assignment and customer introduction",
-                "Sales process and methodology training"
-            ])
-        
-        return base_checklist
\ No newline at end of file
+        # Fresh lists per call, so callers can edit the checklist without touching the templates
+        checklist = {period: list(tasks) for period, tasks in FALLBACK_ONBOARDING_CHECKLIST.items()}
+        checklist["Week 1 - Integration"].extend(FALLBACK_DEPARTMENT_TASKS.get(department, ()))
+        return checklist
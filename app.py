@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 import json
 import os
 from datetime import datetime
@@ -15,6 +14,19 @@ def init_data_manager():
 def init_ai_services():
     return AIServices()
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _dashboard_snapshot(_data_manager, workflows_version, users_version, incidents_version):
+    """Overview metrics and recent incidents, cached until one of the data files changes"""
+    users_df = _data_manager.get_users()
+    incidents_df = _data_manager.get_incidents()
+    return {
+        'active_workflows': len(_data_manager.get_workflows()),
+        'pending_onboarding': int(users_df['status'].value_counts().get('pending', 0)) if not users_df.empty else 0,
+        'open_incidents': int(incidents_df['status'].value_counts().get('open', 0)) if not incidents_df.empty else 0,
+        'avg_resolution': incidents_df['resolution_hours'].mean() if not incidents_df.empty else 0,
+        'recent_incidents': incidents_df.head(5)
+    }
+
 def main():
     st.set_page_config(
         page_title="CrossPilot - AI Workflow Copilot",
@@ -37,39 +49,41 @@ def main():
     st.title("🤖 CrossPilot - AI-Augmented Workflow Copilot")
     st.markdown("### Enterprise Onboarding, Incident Triage & Reporting Platform")
     
+    snapshot = _dashboard_snapshot(
+        data_manager,
+        data_manager.get_data_version("workflows.json"),
+        data_manager.get_data_version("users.csv"),
+        data_manager.get_data_version("incidents.csv")
+    )
+    
     # Overview cards
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.metric(
             label="Active Workflows",
-            value=len(data_manager.get_workflows()),
+            value=snapshot['active_workflows'],
             delta="3 this week"
         )
     
     with col2:
-        users_df = data_manager.get_users()
-        pending_onboarding = len(users_df[users_df['status'] == 'pending'])
         st.metric(
             label="Pending Onboarding",
-            value=pending_onboarding,
+            value=snapshot['pending_onboarding'],
             delta=f"-2 from yesterday"
         )
     
     with col3:
-        incidents_df = data_manager.get_incidents()
-        open_incidents = len(incidents_df[incidents_df['status'] == 'open'])
         st.metric(
             label="Open Incidents",
-            value=open_incidents,
+            value=snapshot['open_incidents'],
             delta="5 new today"
         )
     
     with col4:
-        avg_resolution = incidents_df['resolution_hours'].mean() if not incidents_df.empty else 0
         st.metric(
             label="Avg Resolution (hrs)",
-            value=f"{avg_resolution:.1f}",
+            value=f"{snapshot['avg_resolution']:.1f}",
             delta="-2.3 hrs"
         )
     
@@ -93,8 +107,7 @@ def main():
     # Recent Activity
     st.markdown("### Recent Activity")
     
-    # Get recent incidents
-    recent_incidents = incidents_df.head(5) if not incidents_df.empty else pd.DataFrame()
+    recent_incidents = snapshot['recent_incidents']
     
     if not recent_incidents.empty:
         st.dataframe(
@@ -1,48 +1,79 @@
 import pandas as pd
+import ast
+import csv
 import json
 import os
+import textwrap
+import threading
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+# Use orjson for workflow decoding if available
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+def parse_stored_value(raw: Any, kind: type) -> Any:
+    """Decode a JSON list/dict cell; older rows were saved as Python reprs, and unreadable cells come back empty"""
+    if isinstance(raw, kind):
+        return raw
+    if not isinstance(raw, str):
+        return kind()
+    try:
+        value = json_loads(raw)
+    except ValueError:
+        try:
+            value = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            # e.g. a hand-edited "VPN, Network"
+            return kind()
+    return value if isinstance(value, kind) else kind()
+
+# Every file the data directory holds
+DATA_FILES = ("users.csv", "incidents.csv", "roles.csv", "metrics.csv", "workflows.json")
 
 class DataManager:
     """Data management service for CrossPilot - handles all data operations"""
     
     def __init__(self):
         self.data_dir = "data"
+        self.paths = {filename: os.path.join(self.data_dir, filename) for filename in DATA_FILES}
+        # Parsed CSVs keyed by filename: ((mtime, size) read at, frame, id -> row position)
+        self._frames: Dict[str, tuple] = {}
+        self._frames_lock = threading.Lock()
         self.ensure_data_directory()
         self.initialize_sample_data()
     
     def ensure_data_directory(self):
         """Ensure data directory exists"""
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
+        os.makedirs(self.data_dir, exist_ok=True)
     
     def initialize_sample_data(self):
         """Initialize with sample data if files don't exist"""
         
+        # One directory listing instead of a stat per data file
+        existing = set(os.listdir(self.data_dir))
+        
         # Initialize users data
-        users_file = os.path.join(self.data_dir, "users.csv")
-        if not os.path.exists(users_file):
+        if "users.csv" not in existing:
             self.create_sample_users()
         
         # Initialize incidents data
-        incidents_file = os.path.join(self.data_dir, "incidents.csv")
-        if not os.path.exists(incidents_file):
+        if "incidents.csv" not in existing:
             self.create_sample_incidents()
         
         # Initialize roles data
-        roles_file = os.path.join(self.data_dir, "roles.csv")
-        if not os.path.exists(roles_file):
+        if "roles.csv" not in existing:
             self.create_sample_roles()
         
         # Initialize metrics data
-        metrics_file = os.path.join(self.data_dir, "metrics.csv")
-        if not os.path.exists(metrics_file):
+        if "metrics.csv" not in existing:
             self.create_sample_metrics()
         
         # Initialize workflows data
-        workflows_file = os.path.join(self.data_dir, "workflows.json")
-        if not os.path.exists(workflows_file):
+        if "workflows.json" not in existing:
             self.create_sample_workflows()
     
     def create_sample_users(self):
@@ -105,7 +136,7 @@ class DataManager:
         ]
         
         df = pd.DataFrame(users_data)
-        df.to_csv(os.path.join(self.data_dir, "users.csv"), index=False)
+        df.to_csv(self.paths["users.csv"], index=False)
     
     def create_sample_incidents(self):
         """Create sample incidents data"""
@@ -170,7 +201,7 @@ class DataManager:
         ]
         
         df = pd.DataFrame(incidents_data)
-        df.to_csv(os.path.join(self.data_dir, "incidents.csv"), index=False)
+        df.to_csv(self.paths["incidents.csv"], index=False)
     
     def create_sample_roles(self):
         """Create sample roles and access data"""
@@ -202,7 +233,7 @@ class DataManager:
         ]
         
         df = pd.DataFrame(roles_data)
-        df.to_csv(os.path.join(self.data_dir, "roles.csv"), index=False)
+        df.to_csv(self.paths["roles.csv"], index=False)
     
     def create_sample_metrics(self):
         """Create sample metrics data"""
@@ -234,7 +265,7 @@ class DataManager:
         ]
         
         df = pd.DataFrame(metrics_data)
-        df.to_csv(os.path.join(self.data_dir, "metrics.csv"), index=False)
+        df.to_csv(self.paths["metrics.csv"], index=False)
     
     def create_sample_workflows(self):
         """Create sample workflows data"""
@@ -276,24 +307,120 @@ class DataManager:
             }
         ]
         
-        with open(os.path.join(self.data_dir, "workflows.json"), 'w') as f:
+        with open(self.paths["workflows.json"], 'w') as f:
             json.dump(workflows_data, f, indent=2)
     
+    def get_data_version(self, filename: str) -> int:
+        """Get a version token for a data file, changing whenever it is rewritten"""
+        try:
+            return os.stat(self.paths[filename]).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+    
+    def _file_stamp(self, path: str) -> tuple:
+        """Get the (mtime, size) pair used to tell whether a cached CSV is stale"""
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _cache_entry(self, stamp: tuple, df: pd.DataFrame) -> tuple:
+        """Build a cache entry, indexing row positions by id for tables that have one"""
+        id_index = {record_id: position for position, record_id in enumerate(df['id'])} if 'id' in df.columns else {}
+        return stamp, df, id_index
+    
+    def _cached_frame(self, filename: str) -> tuple:
+        """Get the cache entry for a CSV, re-reading the file only when it changed on disk"""
+        path = self.paths[filename]
+        try:
+            stamp = self._file_stamp(path)
+        except FileNotFoundError:
+            self.invalidate(filename)
+            raise
+        
+        with self._frames_lock:
+            cached = self._frames.get(filename)
+        if cached is None or cached[0] != stamp:
+            cached = self._cache_entry(stamp, pd.read_csv(path))
+            with self._frames_lock:
+                self._frames[filename] = cached
+        return cached
+    
+    def _read_csv(self, filename: str) -> pd.DataFrame:
+        """Read a CSV, reusing the parsed frame until the file changes on disk"""
+        # Callers are free to modify what they get back
+        return self._cached_frame(filename)[1].copy()
+    
+    def _write_csv(self, filename: str, df: pd.DataFrame):
+        """Write a CSV and keep the written frame as its cached copy"""
+        path = self.paths[filename]
+        df.to_csv(path, index=False)
+        with self._frames_lock:
+            self._frames[filename] = self._cache_entry(self._file_stamp(path), df.copy())
+    
+    def _update_rows(self, filename: str, updates: List[Tuple[str, str, Any]]):
+        """Apply (id, column, value) updates to a CSV with one read and one write"""
+        _, cached_df, id_index = self._cached_frame(filename)
+        df = cached_df.copy()
+        by_column: Dict[str, Dict[int, Any]] = {}
+        for record_id, column, value in updates:
+            if record_id in id_index:
+                by_column.setdefault(column, {})[id_index[record_id]] = value
+        
+        for column, values in by_column.items():
+            df.loc[df.index[list(values)], column] = list(values.values())
+        self._write_csv(filename, df)
+    
+    def invalidate(self, filename: Optional[str] = None):
+        """Drop cached frames after files were changed outside this DataManager"""
+        with self._frames_lock:
+            if filename is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(filename, None)
+    
     # User management methods
+    def _append_rows(self, filename: str, rows: List[Dict[str, Any]]) -> bool:
+        """Append records to a CSV without rereading it; False if they have columns the file lacks"""
+        path = self.paths[filename]
+        header = None
+        ends_with_newline = True
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, newline='', encoding='utf-8') as f:
+                header = next(csv.reader(f))
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                ends_with_newline = f.read(1) in b'\r\n'
+            if not set().union(*rows) <= set(header):
+                return False
+        
+        # Same line endings and quoting as DataFrame.to_csv, so both writers produce one format
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            if not ends_with_newline:
+                f.write(os.linesep)
+            fieldnames = header or list(dict.fromkeys(column for row in rows for column in row))
+            writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator=os.linesep)
+            if header is None:
+                writer.writeheader()
+            writer.writerows(rows)
+        return True
+    
+    def _insert_rows(self, filename: str, rows: List[Dict[str, Any]]):
+        """Add records to a CSV, rewriting it only when they bring new columns"""
+        if not self._append_rows(filename, rows):
+            # New columns need the header rewritten
+            df = pd.concat([self._read_csv(filename), pd.DataFrame(rows)], ignore_index=True)
+            self._write_csv(filename, df)
+    
     def get_users(self) -> pd.DataFrame:
         """Get all users"""
         try:
-            return pd.read_csv(os.path.join(self.data_dir, "users.csv"))
+            return self._read_csv("users.csv")
         except FileNotFoundError:
             return pd.DataFrame()
     
     def add_user(self, user_data: Dict[str, Any]) -> bool:
         """Add a new user"""
         try:
-            df = self.get_users()
-            new_row = pd.DataFrame([user_data])
-            df = pd.concat([df, new_row], ignore_index=True)
-            df.to_csv(os.path.join(self.data_dir, "users.csv"), index=False)
+            self._insert_rows("users.csv", [user_data])
             return True
         except Exception as e:
             print(f"Error adding user: {e}")
@@ -302,9 +429,7 @@ class DataManager:
     def update_user_status(self, user_id: str, status: str) -> bool:
         """Update user status"""
         try:
-            df = self.get_users()
-            df.loc[df['id'] == user_id, 'status'] = status
-            df.to_csv(os.path.join(self.data_dir, "users.csv"), index=False)
+            self._update_rows("users.csv", [(user_id, 'status', status)])
             return True
         except Exception as e:
             print(f"Error updating user status: {e}")
@@ -313,29 +438,44 @@ class DataManager:
     def update_user_progress(self, user_id: str, progress: int) -> bool:
         """Update user onboarding progress"""
         try:
-            df = self.get_users()
-            df.loc[df['id'] == user_id, 'onboarding_progress'] = progress
-            df.to_csv(os.path.join(self.data_dir, "users.csv"), index=False)
+            self._update_rows("users.csv", [(user_id, 'onboarding_progress', progress)])
             return True
         except Exception as e:
             print(f"Error updating user progress: {e}")
             return False
     
+    def update_users_bulk(self, updates: List[Tuple[str, str, Any]]) -> bool:
+        """Update several (user id, column, value) fields in a single write"""
+        try:
+            self._update_rows("users.csv", updates)
+            return True
+        except Exception as e:
+            print(f"Error updating users: {e}")
+            return False
+    
+    def update_user_checklists(self, checklists: Dict[str, Dict[str, List[str]]]) -> bool:
+        """Store onboarding checklists for several users in a single write"""
+        try:
+            self._update_rows("users.csv", [
+                (user_id, 'checklist', json.dumps(checklist)) for user_id, checklist in checklists.items()
+            ])
+            return True
+        except Exception as e:
+            print(f"Error updating user checklists: {e}")
+            return False
+    
     # Incident management methods
     def get_incidents(self) -> pd.DataFrame:
         """Get all incidents"""
         try:
-            return pd.read_csv(os.path.join(self.data_dir, "incidents.csv"))
+            return self._read_csv("incidents.csv")
         except FileNotFoundError:
             return pd.DataFrame()
     
     def add_incident(self, incident_data: Dict[str, Any]) -> bool:
         """Add a new incident"""
         try:
-            df = self.get_incidents()
-            new_row = pd.DataFrame([incident_data])
-            df = pd.concat([df, new_row], ignore_index=True)
-            df.to_csv(os.path.join(self.data_dir, "incidents.csv"), index=False)
+            self._insert_rows("incidents.csv", [incident_data])
             return True
         except Exception as e:
             print(f"Error adding incident: {e}")
@@ -344,9 +484,7 @@ class DataManager:
     def update_incident_status(self, incident_id: str, status: str) -> bool:
         """Update incident status"""
         try:
-            df = self.get_incidents()
-            df.loc[df['id'] == incident_id, 'status'] = status
-            df.to_csv(os.path.join(self.data_dir, "incidents.csv"), index=False)
+            self._update_rows("incidents.csv", [(incident_id, 'status', status)])
             return True
         except Exception as e:
             print(f"Error updating incident status: {e}")
@@ -356,34 +494,59 @@ class DataManager:
     def get_workflows(self) -> List[Dict[str, Any]]:
         """Get all workflows"""
         try:
-            with open(os.path.join(self.data_dir, "workflows.json"), 'r') as f:
-                return json.load(f)
+            with open(self.paths["workflows.json"], 'rb') as f:
+                return json_loads(f.read())
         except FileNotFoundError:
             return []
     
     def save_workflow(self, workflow_data: Dict[str, Any]) -> bool:
         """Save a new workflow"""
         try:
-            workflows = self.get_workflows()
-            workflows.append(workflow_data)
-            with open(os.path.join(self.data_dir, "workflows.json"), 'w') as f:
-                json.dump(workflows, f, indent=2)
+            path = self.paths["workflows.json"]
+            if not self._append_json_item(path, workflow_data):
+                workflows = self.get_workflows()
+                workflows.append(workflow_data)
+                with open(path, 'w') as f:
+                    json.dump(workflows, f, indent=2)
             return True
         except Exception as e:
             print(f"Error saving workflow: {e}")
             return False
     
+    def _append_json_item(self, path: str, item: Dict[str, Any]) -> bool:
+        """Append an object to a JSON array file in place; False if the file needs a full rewrite"""
+        if not os.path.exists(path):
+            return False
+        
+        with open(path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - 64))
+            tail = f.read()
+            body = tail.rstrip()
+            last_item = body[:-1].rstrip()
+            # Only splice after a closing object, i.e. a non-empty array of workflows
+            if not body.endswith(b']') or not last_item.endswith(b'}'):
+                return False
+            
+            # Laid out exactly as json.dump(..., indent=2) would write the whole list
+            newline = b'\r\n' if b'\r\n' in tail else b'\n'
+            entry = textwrap.indent(json.dumps(item, indent=2), '  ').encode('utf-8').replace(b'\n', newline)
+            f.seek(size - len(tail) + len(last_item))
+            f.write(b',' + newline + entry + newline + b']')
+            f.truncate()
+        return True
+    
     # Metrics methods
     def get_metrics(self) -> pd.DataFrame:
         """Get metrics data"""
         try:
-            return pd.read_csv(os.path.join(self.data_dir, "metrics.csv"))
+            return self._read_csv("metrics.csv")
         except FileNotFoundError:
             return pd.DataFrame()
     
     def get_roles(self) -> pd.DataFrame:
         """Get roles data"""
         try:
-            return pd.read_csv(os.path.join(self.data_dir, "roles.csv"))
+            return self._read_csv("roles.csv")
         except FileNotFoundError:
             return pd.DataFrame()
@@ -1,14 +1,47 @@
 import json
+import os
+import re
 import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from itertools import islice
+from typing import Dict, List, Any, Optional, Callable
+
+# Finished executions kept in memory; older ones are dropped first
+WORKFLOW_HISTORY_SIZE = 1000
+
+# {{name}} placeholders in step templates
+TEMPLATE_VARIABLE_RE = re.compile(r'\{\{(\w+)\}\}')
+
+# Placeholders that read from the execution context itself
+CONTEXT_VARIABLES = {
+    'workflow_id': 'workflow_id',
+    'execution_id': 'id',
+    'started_at': 'started_at'
+}
+
+def _short_id(num_bytes: int) -> str:
+    """Random hex suffix for step record ids, without building and slicing a whole uuid4"""
+    return os.urandom(num_bytes).hex()
 
 class WorkflowEngine:
     """Core workflow execution engine for CrossPilot"""
     
     def __init__(self):
         self.active_workflows = {}
-        self.workflow_history = []
+        # Finished executions by id, oldest first
+        self.workflow_history = OrderedDict()
+        
+        # Step type -> handler; register new step types here
+        self.step_handlers: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]] = {
+            'Send Email': self.execute_email_step,
+            'Create Ticket': self.execute_ticket_step,
+            'Assign Task': self.execute_task_step,
+            'API Call': self.execute_api_step,
+            'Approval': self.execute_approval_step,
+            'Wait': self.execute_wait_step,
+            'Condition': self.execute_condition_step
+        }
     
     def execute_workflow(self, workflow: Dict[str, Any], trigger_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute a workflow with the given trigger data"""
@@ -54,10 +87,10 @@ class WorkflowEngine:
             execution_context['completed_at'] = datetime.now().isoformat()
         
         finally:
-            # Move to history and remove from active
-            self.workflow_history.append(execution_context.copy())
-            if execution_id in self.active_workflows:
-                del self.active_workflows[execution_id]
+            # Move to history and remove from active; the context is not touched after this
+            self.workflow_history[execution_id] = self.active_workflows.pop(execution_id, execution_context)
+            if len(self.workflow_history) > WORKFLOW_HISTORY_SIZE:
+                self.workflow_history.popitem(last=False)
         
         return execution_context
     
@@ -67,27 +100,16 @@ class WorkflowEngine:
         step_type = step.get('type', 'unknown')
         step_config = step.get('config', {})
         
+        handler = self.step_handlers.get(step_type)
+        if handler is None:
+            return {
+                'success': False,
+                'error': f'Unknown step type: {step_type}',
+                'executed_at': datetime.now().isoformat()
+            }
+        
         try:
-            if step_type == 'Send Email':
-                return self.execute_email_step(step_config, context)
-            elif step_type == 'Create Ticket':
-                return self.execute_ticket_step(step_config, context)
-            elif step_type == 'Assign Task':
-                return self.execute_task_step(step_config, context)
-            elif step_type == 'API Call':
-                return self.execute_api_step(step_config, context)
-            elif step_type == 'Approval':
-                return self.execute_approval_step(step_config, context)
-            elif step_type == 'Wait':
-                return self.execute_wait_step(step_config, context)
-            elif step_type == 'Condition':
-                return self.execute_condition_step(step_config, context)
-            else:
-                return {
-                    'success': False,
-                    'error': f'Unknown step type: {step_type}',
-                    'executed_at': datetime.now().isoformat()
-                }
+            return handler(step_config, context)
         
         except Exception as e:
             return {
@@ -99,6 +121,9 @@ class WorkflowEngine:
     def execute_email_step(self, config: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute email sending step"""
         
+        # One clock read per step, shared by the record and the result
+        executed_at = datetime.now().isoformat()
+        
         to_email = config.get('to', '')
         subject = config.get('subject', '')
         template = config.get('template', '')
@@ -115,31 +140,34 @@ class WorkflowEngine:
             'to': to_email,
             'subject': processed_subject,
             'body': processed_template,
-            'sent_at': datetime.now().isoformat(),
-            'message_id': f'msg_{uuid.uuid4().hex[:8]}'
+            'sent_at': executed_at,
+            'message_id': f'msg_{_short_id(4)}'
         }
         
         return {
             'success': True,
             'result': email_result,
-            'executed_at': datetime.now().isoformat()
+            'executed_at': executed_at
         }
     
     def execute_ticket_step(self, config: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute ticket creation step"""
         
+        now = datetime.now()
+        executed_at = now.isoformat()
+        
         ticket_type = config.get('ticket_type', 'General')
         priority = config.get('priority', 'Medium')
         assign_to = config.get('assign_to', '')
         
         # Create ticket record
         ticket = {
-            'id': f'TKT{datetime.now().strftime("%Y%m%d")}{uuid.uuid4().hex[:4].upper()}',
+            'id': f'TKT{now.strftime("%Y%m%d")}{_short_id(2).upper()}',
             'type': ticket_type,
             'priority': priority,
             'assigned_to': assign_to,
             'created_by': 'CrossPilot Workflow',
-            'created_at': datetime.now().isoformat(),
+            'created_at': executed_at,
             'status': 'open',
             'workflow_execution_id': context['id']
         }
@@ -147,23 +175,25 @@ class WorkflowEngine:
         return {
             'success': True,
             'result': ticket,
-            'executed_at': datetime.now().isoformat()
+            'executed_at': executed_at
         }
     
     def execute_task_step(self, config: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute task assignment step"""
         
+        executed_at = datetime.now().isoformat()
+        
         assign_to = config.get('assign_to', '')
         task_description = config.get('description', '')
         due_date = config.get('due_date', '')
         
         # Create task record
         task = {
-            'id': f'TSK{uuid.uuid4().hex[:8].upper()}',
+            'id': f'TSK{_short_id(4).upper()}',
             'assigned_to': assign_to,
             'description': task_description,
             'due_date': due_date,
-            'created_at': datetime.now().isoformat(),
+            'created_at': executed_at,
             'status': 'assigned',
             'workflow_execution_id': context['id']
         }
@@ -171,12 +201,14 @@ class WorkflowEngine:
         return {
             'success': True,
             'result': task,
-            'executed_at': datetime.now().isoformat()
+            'executed_at': executed_at
         }
     
     def execute_api_step(self, config: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute API call step"""
         
+        executed_at = datetime.now().isoformat()
+        
         url = config.get('url', '')
         method = config.get('method', 'GET')
         headers = config.get('headers', {})
@@ -190,18 +222,20 @@ class WorkflowEngine:
             'method': method,
             'status_code': 200,
             'response': {'success': True, 'message': 'API call simulated'},
-            'called_at': datetime.now().isoformat()
+            'called_at': executed_at
         }
         
         return {
             'success': True,
             'result': api_result,
-            'executed_at': datetime.now().isoformat()
+            'executed_at': executed_at
         }
     
     def execute_approval_step(self, config: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute approval step"""
         
+        executed_at = datetime.now().isoformat()
+        
         approver = config.get('approver', '')
         approval_type = config.get('type', 'manual')
         
@@ -209,23 +243,25 @@ class WorkflowEngine:
         # In reality, this would create an approval request
         
         approval = {
-            'id': f'APP{uuid.uuid4().hex[:8].upper()}',
+            'id': f'APP{_short_id(4).upper()}',
             'approver': approver,
             'type': approval_type,
             'status': 'approved',
-            'approved_at': datetime.now().isoformat(),
+            'approved_at': executed_at,
             'workflow_execution_id': context['id']
         }
         
         return {
             'success': True,
             'result': approval,
-            'executed_at': datetime.now().isoformat()
+            'executed_at': executed_at
         }
     
     def execute_wait_step(self, config: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute wait/delay step"""
         
+        executed_at = datetime.now().isoformat()
+        
         duration = config.get('duration', 0)  # in seconds
         reason = config.get('reason', 'Workflow delay')
         
@@ -235,13 +271,13 @@ class WorkflowEngine:
         wait_result = {
             'duration': duration,
             'reason': reason,
-            'waited_at': datetime.now().isoformat()
+            'waited_at': executed_at
         }
         
         return {
             'success': True,
             'result': wait_result,
-            'executed_at': datetime.now().isoformat()
+            'executed_at': executed_at
         }
     
     def execute_condition_step(self, config: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
@@ -288,25 +324,24 @@ class WorkflowEngine:
     def replace_variables(self, text: str, context: Dict[str, Any]) -> str:
         """Replace variables in text with actual values"""
         
-        if not text:
+        if not text or '{{' not in text:
             return text
         
         variables = context.get('variables', {})
         trigger_data = context.get('trigger_data', {})
         
-        # Replace common variables
-        replacements = {
-            '{{workflow_id}}': context.get('workflow_id', ''),
-            '{{execution_id}}': context.get('id', ''),
-            '{{started_at}}': context.get('started_at', ''),
-            **variables,
-            **trigger_data
-        }
-        
-        for key, value in replacements.items():
-            text = text.replace(key, str(value))
-        
-        return text
+        def lookup(match):
+            # Trigger data overrides workflow variables, which override the context fields
+            name = match.group(1)
+            if name in trigger_data:
+                return str(trigger_data[name])
+            if name in variables:
+                return str(variables[name])
+            if name in CONTEXT_VARIABLES:
+                return str(context.get(CONTEXT_VARIABLES[name], ''))
+            return match.group(0)
+        
+        return TEMPLATE_VARIABLE_RE.sub(lookup, text)
     
     def get_workflow_status(self, execution_id: str) -> Dict[str, Any]:
         """Get the status of a workflow execution"""
@@ -314,12 +349,7 @@ class WorkflowEngine:
         if execution_id in self.active_workflows:
             return self.active_workflows[execution_id]
         
-        # Search in history
-        for execution in self.workflow_history:
-            if execution['id'] == execution_id:
-                return execution
-        
-        return {'error': 'Workflow execution not found'}
+        return self.workflow_history.get(execution_id, {'error': 'Workflow execution not found'})
     
     def get_active_workflows(self) -> List[Dict[str, Any]]:
         """Get all currently active workflow executions"""
@@ -327,4 +357,5 @@ class WorkflowEngine:
     
     def get_workflow_history(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get workflow execution history"""
-        return self.workflow_history[-limit:]
+        start = max(0, len(self.workflow_history) - limit)
+        return list(islice(self.workflow_history.values(), start, None))